@@ -0,0 +1,91 @@
+"""Compares the Jinja + Black and the pre-formatted emitter code generation
+backends for chains of BashOperators of different sizes. Validation and the
+render cache are bypassed so only code generation is timed. Usage:
+
+    python -m benchmarks.codegen --sizes 10 100 1000
+"""
+import argparse
+import json
+import time
+
+import black
+from networkx import DiGraph, add_path
+
+from windmill.models.dags.dag_handler import DagHandler, Links, TaskHandler
+
+
+def chain_dag(size: int) -> DagHandler:
+    tasks = [
+        TaskHandler(
+            f"node-{i}",
+            "BashOperator",
+            "airflow.operators.bash_operator",
+            {
+                "task_id": {"id": "task_id", "type": "str", "value": f"Task{i}"},
+                "bash_command": {
+                    "id": "bash_command",
+                    "type": "str",
+                    "value": f"echo '{i}' && sleep {i % 10}",
+                },
+            },
+        )
+        for i in range(size)
+    ]
+    graph = DiGraph()
+    add_path(graph, [t.node_id for t in tasks])
+    links = Links(graph, {t.node_id: t.snake_name for t in tasks})
+    params = {
+        "dag_id": {"id": "dag_id", "type": "str", "value": f"Chain{size}"},
+        "start_date": {
+            "id": "start_date",
+            "type": "datetime.datetime",
+            "value": "2020-05-20",
+        },
+    }
+    return DagHandler(params, tasks, links, f"chain_{size}")
+
+
+def render_jinja(dag: DagHandler) -> str:
+    res = dag.env.get_template("dag.j2").render(dag=dag)
+    return black.format_str(res, line_length=80)
+
+
+def render_emitter(dag: DagHandler) -> str:
+    return dag.emitter.emit(dag)
+
+
+def best_of(func, dag, repeat):
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func(dag)
+        timings.append(time.perf_counter() - t0)
+    return min(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    for size in args.sizes:
+        dag = chain_dag(size)
+        jinja = best_of(render_jinja, dag, args.repeat)
+        emitter = best_of(render_emitter, dag, args.repeat)
+        print(
+            json.dumps(
+                {
+                    "benchmark": "codegen",
+                    "tasks": size,
+                    "jinja_seconds": jinja,
+                    "emitter_seconds": emitter,
+                    "speedup": jinja / emitter,
+                    "identical": render_jinja(dag) == render_emitter(dag),
+                }
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
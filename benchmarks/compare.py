@@ -0,0 +1,62 @@
+"""Compares two benchmark result files written by benchmarks.scaling --output.
+Results are matched on stage, shape and number of tasks, and the slowdown of
+each is printed as a JSON line. Exits with 1 if any result is slower than
+--threshold times the baseline. Usage:
+
+    python -m benchmarks.compare baseline.jsonl results.jsonl --threshold 1.25
+"""
+import argparse
+import json
+import sys
+
+
+def load_results(filename: str) -> dict:
+    """Returns {(stage, shape, tasks): seconds}. If a file has several runs of
+    the same benchmark the fastest is kept
+    """
+    results = {}
+    with open(filename, "r") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            res = json.loads(line)
+            key = (res["stage"], res.get("shape"), res.get("tasks"))
+            results[key] = min(res["seconds"], results.get(key, float("inf")))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("baseline")
+    parser.add_argument("results")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args(argv)
+
+    baseline = load_results(args.baseline)
+    results = load_results(args.results)
+
+    regressed = False
+    for key in sorted(baseline.keys() & results.keys(), key=str):
+        ratio = results[key] / baseline[key] if baseline[key] else float("inf")
+        regression = ratio > args.threshold
+        regressed = regressed or regression
+        stage, shape, tasks = key
+        print(
+            json.dumps(
+                {
+                    "stage": stage,
+                    "shape": shape,
+                    "tasks": tasks,
+                    "baseline_seconds": baseline[key],
+                    "seconds": results[key],
+                    "ratio": ratio,
+                    "regression": regression,
+                }
+            )
+        )
+
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Times parsing the docstring of every operator in the catalogue, and of DAG,
+with ClassParser.parse_docstring against the fix_docstring + docstring_parser
+path it replaces, and checks that both give the same result. Results are
+printed as JSON lines, and appended to --output if given. Usage:
+
+    python -m benchmarks.docstrings --repeat 5
+"""
+import argparse
+import json
+import logging
+
+from airflow.models.dag import DAG
+from docstring_parser import parse
+
+from windmill.models.operators.operator_index import OperatorIndex
+from windmill.utils.class_parser import ClassParser
+
+from .scaling import best_of, git_commit
+
+
+def parse_docstring_parser(docs: str):
+    """The previous parsing path, in the format of ClassParser.parse_docstring"""
+    parsed = parse(ClassParser.fix_docstring(docs))
+    return (
+        parsed.short_description,
+        parsed.long_description,
+        [(p.arg_name, p.type_name, p.description) for p in parsed.params],
+    )
+
+
+STAGES = {
+    "docstring_parser": parse_docstring_parser,
+    "parse_docstring": ClassParser.parse_docstring,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="File to append JSON results to")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.WARNING)  # Unparseable types are logged per class
+    docs = [c.__doc__ for c in OperatorIndex().operator_list + [DAG] if c.__doc__]
+
+    mismatches = sum(
+        1 for d in docs if ClassParser.parse_docstring(d) != parse_docstring_parser(d)
+    )
+
+    meta = {"benchmark": "docstrings", "commit": git_commit()}
+    for stage, func in STAGES.items():
+        seconds, _ = best_of(lambda: [func(d) for d in docs], args.repeat)
+        line = json.dumps(
+            {
+                **meta,
+                "stage": stage,
+                "docstrings": len(docs),
+                "mismatches": mismatches,
+                "seconds": seconds,
+            }
+        )
+        print(line, flush=True)
+        if args.output:
+            with open(args.output, "a") as f:
+                f.write(line + "\n")
+
+
+if __name__ == "__main__":
+    main()
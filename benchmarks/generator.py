@@ -0,0 +1,119 @@
+"""Generates synthetic WMLs and Airflow DAGs of BashOperators with a given shape
+and number of tasks:
+
+- chain: t0 >> t1 >> ... >> tn
+- fanout: t0 >> [t1, ..., tn]
+- diamond: A lattice of diamonds, each task feeding the two tasks below it
+- random: Each task depends on up to two random earlier tasks (seeded)
+"""
+import math
+import random
+import uuid
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from airflow.models.dag import DAG
+from airflow.operators.bash_operator import BashOperator
+
+from windmill.models.dags.dag_handler import DagHandler
+from windmill.models.operators.operator_index import get_operator_index
+
+SHAPES = ["chain", "fanout", "diamond", "random"]
+
+
+def chain_edges(size: int) -> List[Tuple[int, int]]:
+    return [(i, i + 1) for i in range(size - 1)]
+
+
+def fanout_edges(size: int) -> List[Tuple[int, int]]:
+    return [(0, i) for i in range(1, size)]
+
+
+def diamond_edges(size: int) -> List[Tuple[int, int]]:
+    width = max(int(math.sqrt(size)), 1)
+    edges = []
+    for i in range(size):
+        row, col = divmod(i, width)
+        for below in [(row + 1) * width + col, (row + 1) * width + col + 1]:
+            if below < size and below // width == row + 1:
+                edges.append((i, below))
+    return edges
+
+
+def random_edges(size: int, seed: int = 0) -> List[Tuple[int, int]]:
+    rand = random.Random(seed)
+    edges = set()
+    for i in range(1, size):
+        for _ in range(2):
+            edges.add((rand.randrange(i), i))
+    return sorted(edges)
+
+
+def edges(shape: str, size: int) -> List[Tuple[int, int]]:
+    """Edges between task indexes for a shape
+
+    Raises:
+        ValueError: If shape is not one of SHAPES
+    """
+    if shape not in SHAPES:
+        raise ValueError(f"Unknown shape '{shape}'")
+    return globals()[f"{shape}_edges"](size)
+
+
+def generate_wml(shape: str, size: int) -> Dict:
+    """Creates a WML matching MinimalWmlSchema. Nodes carry the full marshalled
+    BashOperator, as they would when saved from the editor
+
+    Returns:
+        Dict: WML dict
+    """
+    dag = DagHandler.marshall_dag_docstring()
+    values = {"dag_id": f"{shape.title()}{size}", "start_date": "2020-05-20"}
+    for parameter in dag["parameters"]:
+        if parameter["id"] in values:
+            parameter["value"] = values[parameter["id"]]
+    dag["name"] = values["dag_id"]
+
+    node_ids = [str(uuid.UUID(int=i)) for i in range(size)]
+    nodes = {}
+    for i, node_id in enumerate(node_ids):
+        operator = get_operator_index().get_marshalled_operator("BashOperator")
+        values = {"task_id": f"Task{i}", "bash_command": f"echo {i}"}
+        for parameter in operator["properties"]["parameters"]:
+            if parameter["id"] in values:
+                parameter["value"] = values[parameter["id"]]
+        operator["properties"]["name"] = values["task_id"]
+        nodes[node_id] = {
+            "id": node_id,
+            "position": {"x": 0, "y": 0},
+            "properties": operator["properties"],
+            "type": operator["type"],
+        }
+
+    links = {}
+    for i, (up, down) in enumerate(edges(shape, size)):
+        link_id = f"link-{i}"
+        links[link_id] = {
+            "id": link_id,
+            "from": {"nodeId": node_ids[up], "portId": "out_port"},
+            "to": {"nodeId": node_ids[down], "portId": "in_port"},
+        }
+
+    return {"filename": f"{shape}_{size}", "dag": dag, "nodes": nodes, "links": links}
+
+
+def generate_dag(shape: str, size: int) -> DAG:
+    """Creates an Airflow DAG of BashOperators
+
+    Returns:
+        DAG: Airflow DAG
+    """
+    dag = DAG(f"{shape.title()}{size}", start_date=datetime(2020, 5, 20))
+    tasks = [
+        BashOperator(task_id=f"Task{i}", bash_command=f"echo {i}", dag=dag)
+        for i in range(size)
+    ]
+    for up, down in edges(shape, size):
+        tasks[up].set_downstream(tasks[down])
+    dag.fileloc = f"{shape}_{size}.py"
+    return dag
@@ -0,0 +1,106 @@
+"""Measures the memory retained per task when a WML is loaded, with tracemalloc.
+Parameters are held as Parameter objects referencing shared ParameterSpecs -
+the dict stage holds the same parameters as plain dicts, as they were before,
+for comparison. The WML is parsed from JSON inside the measured block so that
+strings aren't shared with the input. Results are printed as JSON lines, and
+appended to --output if given. Usage:
+
+    python -m benchmarks.memory --sizes 1000 10000
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+
+from windmill.models.dags.dag_handler import DagHandler
+from marshmallow import EXCLUDE
+
+from windmill.models.schemas.app_schemas import (
+    MinimalWmlSchema,
+    OperatorParameterSchema,
+)
+from windmill.models.schemas.compiled_schema import compiled_schema
+
+from .generator import generate_wml
+from .scaling import git_commit
+
+
+def dict_params(wml):
+    """Parameters of each node as plain dicts"""
+    loader = compiled_schema(OperatorParameterSchema)
+    tasks = []
+    for node in wml["nodes"].values():
+        params = loader.load_many(node["properties"]["parameters"])
+        tasks.append(
+            {
+                p["id"]: p
+                for p in params
+                if p.get("value") and p["value"] != p.get("default")
+            }
+        )
+    return tasks
+
+
+def compact_params(wml):
+    """Parameters of each node as loaded by DagHandler"""
+    return [
+        DagHandler.parameter_list_to_dict(node["properties"]["parameters"])
+        for node in wml["nodes"].values()
+    ]
+
+
+STAGES = {
+    "dict_params": dict_params,
+    "compact_params": compact_params,
+    "load_from_wml": lambda wml: DagHandler.load_from_wml(
+        compiled_schema(MinimalWmlSchema).load(wml, unknown=EXCLUDE)
+    ),
+}
+
+
+def retained_bytes(func, raw: str) -> int:
+    """Bytes still allocated after func(json.loads(raw)) returns, while its
+    result is alive
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    res = func(json.loads(raw))
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del res
+    return retained
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--shape", default="chain")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--output", help="File to append JSON results to")
+    args = parser.parse_args(argv)
+
+    meta = {"benchmark": "memory", "commit": git_commit()}
+    for size in args.sizes:
+        raw = json.dumps(generate_wml(args.shape, size))
+        for stage in args.stages:
+            retained = retained_bytes(STAGES[stage], raw)
+            line = json.dumps(
+                {
+                    **meta,
+                    "stage": stage,
+                    "shape": args.shape,
+                    "tasks": size,
+                    "bytes": retained,
+                    "bytes_per_task": round(retained / size),
+                }
+            )
+            print(line, flush=True)
+            if args.output:
+                with open(args.output, "a") as f:
+                    f.write(line + "\n")
+
+
+if __name__ == "__main__":
+    main()
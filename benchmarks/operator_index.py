@@ -0,0 +1,67 @@
+"""Compares serial and parallel builds of the operator index
+
+Each build runs in a fresh interpreter so that no module import is shared
+between runs. Usage:
+
+    python -m benchmarks.operator_index --processes 1 2 4 8
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+BUILD_SNIPPET = """
+import json, time
+t0 = time.perf_counter()
+from windmill.models.operators.operator_index import OperatorIndex
+ops = OperatorIndex(processes={processes}).marshall_operator_list()
+print(json.dumps({{"seconds": time.perf_counter() - t0, "operators": len(ops)}}))
+"""
+
+
+def time_build(processes: int) -> dict:
+    res = subprocess.run(
+        [sys.executable, "-c", BUILD_SNIPPET.format(processes=processes)],
+        stdout=subprocess.PIPE,
+        check=True,
+    )
+    return json.loads(res.stdout.decode().strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--processes", type=int, nargs="+", default=[1, 2, os.cpu_count() or 1]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    serial = min(time_build(0)["seconds"] for _ in range(args.repeat))
+    print(
+        json.dumps(
+            {
+                "benchmark": "operator_index",
+                "mode": "serial",
+                "processes": 0,
+                "seconds": serial,
+            }
+        )
+    )
+    for processes in args.processes:
+        seconds = min(time_build(processes)["seconds"] for _ in range(args.repeat))
+        print(
+            json.dumps(
+                {
+                    "benchmark": "operator_index",
+                    "mode": "parallel",
+                    "processes": processes,
+                    "seconds": seconds,
+                    "speedup": serial / seconds,
+                }
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
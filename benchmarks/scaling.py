@@ -0,0 +1,128 @@
+"""Times each stage of the WML <-> DAG pipeline on synthetic DAGs of different
+shapes and sizes - see benchmarks.generator. The render cache is disabled so
+to_python always renders and validates. Results are printed as JSON lines, and
+appended to --output if given, tagged with the current git commit so that runs
+can be compared with benchmarks.compare. schema_load and compiled_schema_load
+time the same WML through marshmallow and through CompiledSchema. Usage:
+
+    python -m benchmarks.scaling --shapes chain random --sizes 10 1000 50000
+    python -m benchmarks.scaling --output results.jsonl
+"""
+import argparse
+import json
+import platform
+import subprocess
+import time
+
+from marshmallow import EXCLUDE
+
+from windmill.models.dags.dag_handler import DagHandler, Links
+from windmill.models.operators.operator_index import OperatorIndex
+from windmill.models.schemas.app_schemas import MinimalWmlSchema
+from windmill.models.schemas.compiled_schema import compiled_schema
+from windmill.utils.render_cache import init_render_cache
+
+from .generator import SHAPES, generate_dag, generate_wml
+
+STAGES = [
+    "schema_load",
+    "compiled_schema_load",
+    "load_from_wml",
+    "layout",
+    "bitshift_paths",
+    "to_python",
+    "to_wml",
+    "load_from_dag",
+]
+
+
+def git_commit() -> str:
+    try:
+        res = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+        return res.stdout.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def best_of(func, repeat):
+    """Returns the fastest of repeat calls to func, and its last result"""
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        res = func()
+        timings.append(time.perf_counter() - t0)
+    return min(timings), res
+
+
+def time_stages(shape: str, size: int, stages, repeat: int):
+    """Yields (stage, seconds) for each requested stage. Stages are run in
+    pipeline order, and each uses the previous stage's result
+    """
+    wml = generate_wml(shape, size)
+    parsed = MinimalWmlSchema().load(wml, partial=False, unknown=EXCLUDE)
+    handler = DagHandler.load_from_wml(parsed)
+
+    stage_funcs = {
+        "schema_load": lambda: MinimalWmlSchema().load(
+            wml, partial=False, unknown=EXCLUDE
+        ),
+        "compiled_schema_load": lambda: compiled_schema(MinimalWmlSchema).load(
+            wml, unknown=EXCLUDE
+        ),
+        "load_from_wml": lambda: DagHandler.load_from_wml(parsed),
+        "layout": lambda: Links.graph_to_coords(handler.links.graph),
+        "bitshift_paths": lambda: handler.links.get_bitshift_paths(),
+        "to_python": lambda: handler.to_python(),
+        "to_wml": lambda: handler.to_wml(),
+    }
+    for stage in stages:
+        if stage == "load_from_dag":
+            dag = generate_dag(shape, size)
+            seconds, _ = best_of(lambda: DagHandler.load_from_dag(dag), repeat)
+        else:
+            seconds, _ = best_of(stage_funcs[stage], repeat)
+        yield stage, seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--shapes", nargs="+", choices=SHAPES, default=SHAPES)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-operator-index", action="store_true")
+    parser.add_argument("--output", help="File to append JSON results to")
+    args = parser.parse_args(argv)
+
+    init_render_cache(max_entries=0)
+    meta = {"commit": git_commit(), "python": platform.python_version()}
+
+    def emit(result):
+        line = json.dumps({"benchmark": "scaling", **meta, **result})
+        print(line, flush=True)
+        if args.output:
+            with open(args.output, "a") as f:
+                f.write(line + "\n")
+
+    if not args.no_operator_index:
+        seconds, ops = best_of(
+            lambda: OperatorIndex().marshall_operator_list(), args.repeat
+        )
+        emit({"stage": "operator_index", "operators": len(ops), "seconds": seconds})
+
+    for shape in args.shapes:
+        for size in args.sizes:
+            timings = time_stages(shape, size, args.stages, args.repeat)
+            for stage, seconds in timings:
+                emit(
+                    {"stage": stage, "shape": shape, "tasks": size, "seconds": seconds}
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
+import gzip
 import json
 import logging
 import os
+import sys
 import tempfile
 from copy import deepcopy
 from unittest import TestCase
@@ -9,10 +11,16 @@ from flask import Response
 
 from windmill.config.project_config import ProjectConfig
 from windmill.http.api.endpoints import build_app
+from windmill.models.dags.dag_compiler import (
+    compile_wml,
+    compile_wmls,
+    init_compile_pool,
+)
 from windmill.models.operators.operator_handler import OperatorHandler
 from windmill.tasks.init import CreateProject
 
 from . import test_datafiles
+from .test_operators import CUSTOM_OPERATOR
 
 
 class Fixture(TestCase):
@@ -47,6 +55,24 @@ class TestV1Operators(Fixture):
                 logging.info(f"{operator}")
                 raise e
 
+    def test_get_compressed_with_etag(self):
+        res: Response = self.client.get("/v1/operators")
+        identity_etag = res.headers["ETag"]
+        assert res.headers["Cache-Control"] == "no-cache"
+
+        res = self.client.get("/v1/operators", headers={"Accept-Encoding": "gzip"})
+        assert res.status_code == 200
+        assert res.headers["Content-Encoding"] == "gzip"
+        assert res.headers["ETag"] != identity_etag
+        assert json.loads(gzip.decompress(res.data)) == json.loads(
+            self.client.get("/v1/operators").data
+        )
+
+        for etag in [identity_etag, res.headers["ETag"]]:
+            res = self.client.get("/v1/operators", headers={"If-None-Match": etag})
+            assert res.status_code == 304
+            assert res.data == b""
+
 
 class TestV1Dag(Fixture):
     def setUp(self):
@@ -69,6 +95,9 @@ class TestV1Dag(Fixture):
             assert param["id"]
             assert param["type"]
 
+        res = self.client.get("/v1/dag", headers={"If-None-Match": res.headers["ETag"]})
+        assert res.status_code == 304
+
     def test_post_valid_wml(self):
         data = json.loads(test_datafiles["Valid.wml"])
 
@@ -81,6 +110,20 @@ class TestV1Dag(Fixture):
         with open(os.path.join(self.base_path, "valid_dag.py"), "r") as f:
             assert f.read().strip() == test_datafiles["valid.py"].strip()
 
+    def test_post_unchanged_dag(self):
+        data = test_datafiles["Valid.wml"]
+        self.client.post(
+            "/v1/dag/Valid.wml", data=data, content_type="application/json"
+        )
+
+        dag_path = os.path.join(self.base_path, "valid_dag.py")
+        os.utime(dag_path, (0, 0))
+        res: Response = self.client.post(
+            "/v1/dag/Valid.wml", data=data, content_type="application/json"
+        )
+        assert res.status_code == 201
+        assert os.stat(dag_path).st_mtime == 0  # Unchanged DAGs aren't rewritten
+
     def test_post_invalid_wml(self):
         data = {"no": "data"}
         res: Response = self.client.post(
@@ -88,6 +131,46 @@ class TestV1Dag(Fixture):
         )
         assert res.status_code == 400
 
+    def test_post_non_object_wml(self):
+        for data in ["Valid.wml", ["a", "list"], None]:
+            res: Response = self.client.post(
+                "/v1/dag/Valid.wml",
+                data=json.dumps(data),
+                content_type="application/json",
+            )
+            assert res.status_code == 400
+        assert os.listdir(self.base_path) == []
+
+    def test_post_custom_operator_dag(self):
+        with open(os.path.join(self.conf.operators_dir, "greeting.py"), "w") as f:
+            f.write(CUSTOM_OPERATOR.format(name="GreetingOperator"))
+        self.addCleanup(sys.modules.pop, "greeting", None)
+
+        data = json.loads(test_datafiles["Valid.wml"])
+        node = next(iter(data["nodes"].values()))
+        node["type"] = "GreetingOperator"
+        node["properties"]["module"] = "greeting"
+        node["properties"]["parameters"] = [
+            p for p in node["properties"]["parameters"] if p["inheritedFrom"]
+        ] + [{"id": "greeting", "type": "str", "value": "hi", "required": False}]
+
+        res: Response = self.client.post(
+            "/v1/dag/Valid.wml", data=json.dumps(data), content_type="application/json"
+        )
+        assert res.status_code == 201, res.data
+        with open(os.path.join(self.base_path, "valid_dag.py"), "r") as f:
+            assert "from greeting import GreetingOperator" in f.read()
+
+        # Compile workers import custom operators too
+        init_compile_pool(processes=2)
+        try:
+            results = compile_wmls(
+                [("Valid.wml", data), ("Other.wml", data)], self.conf.dags_dir
+            )
+        finally:
+            init_compile_pool()
+        assert [r["status"] for r in results] == [201, 201], results
+
     def test_post_invalid_dag(self):
         data = json.loads(test_datafiles["Valid.wml"])
         existing_link = deepcopy(data)["links"].popitem()[1]
@@ -103,6 +186,104 @@ class TestV1Dag(Fixture):
         assert res.status_code == 400
         assert res.data == b"Error: Links do not form a valid DAG"
 
+        # Nothing is saved if the DAG doesn't compile
+        assert os.listdir(self.base_path) == []
+        wml_dir = os.path.join(self.tmpdir.name, self.conf.name, self.conf.wml_dir)
+        assert os.listdir(wml_dir) == []
+
+
+class TestV1DagsBatch(Fixture):
+    def test_post_batch(self):
+        data = json.loads(test_datafiles["Valid.wml"])
+        wml_dir = os.path.join(self.tmpdir.name, self.conf.name, self.conf.wml_dir)
+        with open(os.path.join(wml_dir, "Existing.wml"), "w") as f:
+            json.dump(data, f)
+
+        body = {
+            "wmls": [
+                "Existing.wml",
+                {"name": "Valid.wml", "wml": data},
+                {"name": "Invalid.wml", "wml": {"no": "data"}},
+                "Missing.wml",
+            ]
+        }
+        res: Response = self.client.post(
+            "/v1/dags:batch", data=json.dumps(body), content_type="application/json"
+        )
+        assert res.status_code == 200
+
+        results = res.get_json()["results"]
+        assert [r["name"] for r in results] == [
+            "Existing.wml",
+            "Valid.wml",
+            "Invalid.wml",
+            "Missing.wml",
+        ]
+        assert [r["status"] for r in results] == [201, 201, 400, 404]
+        assert results[0]["dag_file"] == "valid_dag.py"
+        assert all(r["duration"] >= 0 for r in results)
+        assert os.path.exists(os.path.join(wml_dir, "Valid.wml"))
+
+    def test_post_batch_rejects_paths(self):
+        data = json.loads(test_datafiles["Valid.wml"])
+        for item in ["../Valid.wml", {"name": "../../x.wml", "wml": data}, ".."]:
+            res: Response = self.client.post(
+                "/v1/dags:batch",
+                data=json.dumps({"wmls": [item]}),
+                content_type="application/json",
+            )
+            assert res.status_code == 400
+        assert not os.path.exists(os.path.join(self.tmpdir.name, "x.wml"))
+
+    def test_post_batch_rejects_wml_strings(self):
+        wml_file = os.path.join(self.tmpdir.name, "outside.wml")
+        with open(wml_file, "w") as f:
+            f.write(test_datafiles["Valid.wml"])
+
+        body = {"wmls": [{"name": "x.wml", "wml": wml_file}]}
+        res: Response = self.client.post(
+            "/v1/dags:batch", data=json.dumps(body), content_type="application/json"
+        )
+        assert res.status_code == 400
+
+    def test_compile_wml_rejects_paths(self):
+        data = json.loads(test_datafiles["Valid.wml"])
+        res = compile_wml("../x.wml", data, self.conf.dags_dir, self.conf.wml_dir)
+        assert res["status"] == 400
+        assert res["dag_file"] is None
+        assert not os.path.exists("x.wml")
+
+    def test_compile_wml_only_reads_wml_dir(self):
+        wml_file = os.path.join(self.tmpdir.name, "outside.wml")
+        with open(wml_file, "w") as f:
+            f.write(test_datafiles["Valid.wml"])
+        os.symlink(wml_file, os.path.join(self.conf.wml_dir, "link.wml"))
+
+        res = compile_wml(wml_file, None, self.conf.dags_dir, self.conf.wml_dir)
+        assert res["status"] == 400
+        res = compile_wml("link.wml", None, self.conf.dags_dir, self.conf.wml_dir)
+        assert res["status"] == 400
+        res = compile_wml("x.wml", wml_file, self.conf.dags_dir, self.conf.wml_dir)
+        assert res["status"] == 400
+        assert not os.listdir(self.conf.dags_dir)
+
+    def test_compile_wmls_on_workers(self):
+        data = json.loads(test_datafiles["Valid.wml"])
+        wmls = [("Valid.wml", data), ("Invalid.wml", {"no": "data"})]
+        init_compile_pool(processes=2)
+        try:
+            results = compile_wmls(wmls, self.conf.dags_dir, wml_dir=self.conf.wml_dir)
+        finally:
+            init_compile_pool()
+        assert [r["status"] for r in results] == [201, 400]
+        assert results[0]["dag_file"] == "valid_dag.py"
+
+    def test_post_batch_invalid_body(self):
+        res: Response = self.client.post(
+            "/v1/dags:batch", data=json.dumps(["a"]), content_type="application/json"
+        )
+        assert res.status_code == 400
+
 
 class TestV1Wmls(Fixture):
     def setUp(self):
@@ -123,6 +304,25 @@ class TestV1Wmls(Fixture):
         data = res.get_json()
         assert data == ["test1.wml"]
 
+    def test_list_wmls(self):
+        for name in ["b.wml", "a.wml", "c.wml"]:
+            with open(os.path.join(self.base_path, name), "w+") as f:
+                f.write(test_datafiles["Valid.wml"])
+
+        res: Response = self.client.get("/v1/wmls?sort=-name&limit=2")
+        assert res.status_code == 200
+
+        data = res.get_json()
+        assert data["total"] == 3
+        assert [w["name"] for w in data["wmls"]] == ["c.wml", "b.wml"]
+        assert data["wmls"][0]["dag_id"] == "ValidDag"
+
+        res = self.client.get("/v1/wmls?prefix=a")
+        assert [w["name"] for w in res.get_json()["wmls"]] == ["a.wml"]
+
+        res = self.client.get("/v1/wmls?sort=unknown")
+        assert res.status_code == 400
+
     def test_get_file(self):
         with open(os.path.join(self.base_path, "test2.wml"), "w+") as f:
             json.dump(["a", "list"], f)
@@ -1,15 +1,27 @@
+import json
 import os
+import sys
 import tempfile
-from unittest import TestCase
+from unittest import TestCase, mock
 
 from windmill.cli.cli import Cli
+from windmill.config.run_config import RunConfig
 from windmill.exceptions import InitError
+from windmill.tasks.run import StartWebserver, import_gunicorn_base
+
+from . import test_datafiles
 
 
 cli_parser = Cli.get_parser()
 
+# Tests chdir into temp folders, which are deleted once they finish
+start_dir = os.getcwd()
+
 
 class TestCli(TestCase):
+    def tearDown(self):
+        os.chdir(start_dir)
+
     def test_init_empty_folder(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             os.chdir(tmpdir)
@@ -36,3 +48,102 @@ class TestCli(TestCase):
             args = cli_parser.parse_args(["init", "--name", "test"])
             exc = args.func(**vars(args))
             assert type(exc) == InitError
+
+    def test_compile(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            os.chdir(tmpdir)
+            args = cli_parser.parse_args(["init", "--name", "test"])
+            args.func(**vars(args))
+            os.chdir("test")
+
+            with open(os.path.join("wmls", "Valid.wml"), "w") as f:
+                f.write(test_datafiles["Valid.wml"])
+            with open(os.path.join("wmls", "Invalid.wml"), "w") as f:
+                json.dump({"no": "data"}, f)
+
+            params = vars(cli_parser.parse_args(["compile", "--wmls", "Valid.wml"]))
+            params.pop("func")(**params)
+            assert os.listdir("dags") == ["valid_dag.py"]
+
+    def test_run_server_options(self):
+        args = cli_parser.parse_args(
+            ["run", "--server-workers", "4", "--server-threads", "2"]
+        )
+        assert args.server_workers == 4
+        assert args.server_threads == 2
+        assert args.request_timeout == 60
+
+    def test_build(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            os.chdir(tmpdir)
+            args = cli_parser.parse_args(["init", "--name", "test"])
+            args.func(**vars(args))
+            os.chdir("test")
+
+            with open(os.path.join("wmls", "Valid.wml"), "w") as f:
+                f.write(test_datafiles["Valid.wml"])
+
+            def build():
+                params = vars(cli_parser.parse_args(["build", "--workers", "0"]))
+                return params.pop("func")(**params)
+
+            res = build()
+            assert [r["name"] for r in res.built] == ["Valid.wml"]
+            assert os.listdir("dags") == ["valid_dag.py"]
+
+            res = build()
+            assert res.built == []
+            assert res.unchanged == ["Valid.wml"]
+
+            os.remove(os.path.join("wmls", "Valid.wml"))
+            res = build()
+            assert res.removed == ["valid_dag.py"]
+            assert os.listdir("dags") == []
+
+
+class TestGunicorn(TestCase):
+    def setUp(self):
+        os.chdir(start_dir)  # Gunicorn needs a working directory that exists
+
+    def test_gunicorn_app(self):
+        try:
+            import gunicorn
+        except ImportError:
+            self.skipTest("Needs the gunicorn extra")
+
+        conf = RunConfig(
+            port=8123,
+            hostname="127.0.0.1",
+            server_workers=3,
+            server_threads=2,
+            validation_workers=1,
+            validation_timeout=5,
+            validation_memory_mb=0,
+            validation_max_jobs=10,
+        )
+        app = object()
+        server = StartWebserver.gunicorn_app(app, conf)
+        assert server.cfg.bind == ["127.0.0.1:8123"]
+        assert server.cfg.workers == 3
+        assert server.cfg.threads == 2
+        assert server.cfg.preload_app
+        assert server.load() is app
+
+        with mock.patch("windmill.tasks.run.init_validation_pool") as init_pool:
+            with mock.patch("windmill.tasks.run.init_compile_pool") as init_compile:
+                server.cfg.post_fork(None, None)
+        init_pool.assert_called_once_with(
+            processes=1, timeout=5, memory_limit_mb=None, max_jobs_per_worker=10
+        )
+        init_compile.assert_called_once_with(
+            processes=0, timeout=5, memory_limit_mb=None, max_jobs_per_worker=10
+        )
+
+    def test_missing_gunicorn(self):
+        with mock.patch.dict(sys.modules, {"gunicorn.app.base": None}):
+            with self.assertRaisesRegex(ImportError, r"airflow-windmill\[gunicorn\]"):
+                import_gunicorn_base()
+
+            params = vars(cli_parser.parse_args(["run", "--server-workers", "2"]))
+            exc = params.pop("func")(**params)
+        assert isinstance(exc, ImportError)
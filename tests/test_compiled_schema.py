@@ -0,0 +1,60 @@
+import copy
+import json
+from unittest import TestCase
+
+from marshmallow import EXCLUDE, INCLUDE
+from marshmallow.exceptions import ValidationError
+
+from windmill.models.schemas.app_schemas import MinimalWmlSchema
+from windmill.models.schemas.compiled_schema import compiled_schema
+
+from . import test_datafiles
+
+
+def load(load_func, data, unknown=None):
+    try:
+        return "ok", load_func(data, unknown=unknown)
+    except ValidationError as e:
+        return "error", e.messages
+
+
+class TestCompiledSchema(TestCase):
+    def setUp(self):
+        self.wml = json.loads(test_datafiles["Valid.wml"])
+        self.compiled = compiled_schema(MinimalWmlSchema)
+
+    def assert_same(self, data, unknown=None):
+        expected = load(MinimalWmlSchema().load, data, unknown)
+        assert load(self.compiled.load, data, unknown) == expected
+
+    def test_valid(self):
+        for unknown in [None, EXCLUDE, INCLUDE]:
+            with self.subTest(unknown=unknown):
+                self.assert_same(self.wml, unknown)
+        assert compiled_schema(MinimalWmlSchema) is self.compiled
+
+    def test_invalid(self):
+        node_id = next(iter(self.wml["nodes"]))
+        param = ["nodes", node_id, "properties", "parameters", 0]
+        mutations = [
+            (["filename"], None),
+            (["filename"], 1),
+            (["dag", "parameters"], {}),
+            (["nodes", node_id, "position", "x"], "1"),
+            (["nodes", node_id, "position", "x"], True),
+            (param + ["required"], "yes"),
+            (param + ["value"], None),
+            (param + ["extra"], 1),
+        ]
+        for path, value in mutations:
+            with self.subTest(path=path, value=value):
+                wml = copy.deepcopy(self.wml)
+                parent = wml
+                for key in path[:-1]:
+                    parent = parent[key]
+                parent[path[-1]] = value
+                self.assert_same(wml, EXCLUDE)
+
+        wml = copy.deepcopy(self.wml)
+        del wml["links"]
+        self.assert_same(wml, EXCLUDE)
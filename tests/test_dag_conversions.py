@@ -1,12 +1,15 @@
 import json
+import time
 from copy import deepcopy
-from unittest import TestCase
+from unittest import TestCase, mock
+import black
 import networkx as nx
 from marshmallow import EXCLUDE
 
 from windmill.constants import GraphConstants
 from windmill.exceptions import DagHandlerValidationError
 from windmill.utils.import_handler import import_str_as_module
+from windmill.utils.render_cache import init_render_cache
 from windmill.models.schemas.app_schemas import MinimalWmlSchema
 from windmill.models.dags.dag_handler import DagHandler, TaskHandler, Links
 
@@ -73,6 +76,87 @@ class TestWmlToPyMarshalling(Fixture):
         py_code = dag_handler.to_python()
         assert py_code
 
+    def test_wml_conversion_to_python__cached_on_position_changes(self):
+        init_render_cache()
+        py_code = DagHandler.load_from_wml(self.valid_wml_dict).to_python()
+
+        moved_wml = deepcopy(self.valid_wml_dict)
+        for node in moved_wml["nodes"].values():
+            node["position"] = {"x": 1, "y": 2}
+        dag_handler = DagHandler.load_from_wml(moved_wml)
+        with mock.patch("black.format_str") as format_str:
+            assert dag_handler.to_python() == py_code
+            format_str.assert_not_called()
+
+    def test_wml_conversion_to_python__not_cached_on_param_changes(self):
+        init_render_cache()
+        dag_handler = DagHandler.load_from_wml(self.valid_wml_dict)
+        key = dag_handler.render_key()
+        dag_handler.to_python()
+
+        dag_handler.tasks[0].params["bash_command"]["value"] = "echo 3"
+        assert dag_handler.render_key() != key
+        assert "echo 3" in dag_handler.to_python()
+
+    def test_render_key_changes_with_airflow_version(self):
+        dag_handler = DagHandler.load_from_wml(self.valid_wml_dict)
+        key = dag_handler.render_key()
+        with mock.patch("windmill.models.dags.dag_handler.airflow_version", "99.0"):
+            assert dag_handler.render_key() != key
+
+    def test_unknown_codegen_backend(self):
+        dag_handler = DagHandler.load_from_wml(self.valid_wml_dict)
+        with self.assertRaisesRegex(ValueError, "Unknown code generation backend"):
+            dag_handler.to_python(backend="nope")
+        with self.assertRaisesRegex(ValueError, "Unknown code generation backend"):
+            DagHandler.set_codegen_backend("nope")
+        assert DagHandler.codegen_backend != "nope"
+
+    def test_wml_conversion_to_python__emitter_backend(self):
+        dag_handler = DagHandler.load_from_wml(self.valid_wml_dict)
+        res = dag_handler.to_python(backend="emitter")
+        assert res.strip() == self.valid_py.strip()
+
+    def test_emitter_matches_black(self):
+        dag_handler = DagHandler.load_from_wml(self.valid_wml_dict)
+        task = dag_handler.tasks[0]
+        for value in ["echo 1", "echo '1'", 'echo "1"', "echo " + "1" * 80]:
+            task.params["bash_command"]["value"] = value
+            for bash_command_len in [10, 50, 100]:
+                task.params["env"] = {
+                    "id": "env",
+                    "type": "str",
+                    "value": "e" * bash_command_len,
+                }
+
+                rendered = dag_handler.env.get_template("dag.j2").render(
+                    dag=dag_handler
+                )
+                expected = black.format_str(rendered, line_length=80)
+                assert dag_handler.emitter.emit(dag_handler) == expected
+
+    def test_emitter_matches_black__containers(self):
+        dag_handler = DagHandler.load_from_wml(self.valid_wml_dict)
+        task = dag_handler.tasks[0]
+        values = [
+            {},
+            {"HOME": "/tmp"},
+            {"key_{}".format(i): "it's value {}".format(i) for i in range(8)},
+            {"nested": {"deep": ["a" * 30, 'say "hi"', None, True, -1.5e-07]}},
+            ["x" * 100],
+            [[{"a": 1, "b": 2}] * 4],
+            [12345678, 0.000123456789, 1e22],
+        ]
+        for value in values:
+            for typ in ["dict", "list"]:
+                task.params["env"] = {"id": "env", "type": typ, "value": value}
+
+                rendered = dag_handler.env.get_template("dag.j2").render(
+                    dag=dag_handler
+                )
+                expected = black.format_str(rendered, line_length=80)
+                assert dag_handler.emitter.emit(dag_handler) == expected
+
     def test_wml_marshall__daghandler_sanity(self):
         di = DagHandler.load_from_wml(self.valid_wml_dict)
         assert di.params["dag_id"]["value"] == "ValidDag"
@@ -82,6 +166,11 @@ class TestWmlToPyMarshalling(Fixture):
         # Note that the rest of the values are defaults and are ignored
         assert list(di.params.keys()) == ["dag_id", "description", "start_date"]
 
+        # Tasks share parameter specs, and only hold their own values
+        first, second = [t.params["task_id"] for t in di.tasks]
+        assert first.spec is second.spec
+        assert first["value"] != second["value"]
+
     def test_link_to_bitshift_conversions(self):
         # This example is defined in the graph_to_efficient_representation docs
         G = nx.DiGraph()
@@ -163,6 +252,130 @@ class TestWmlToPyMarshalling(Fixture):
             DagHandler.load_from_wml(self.valid_wml_dict)
 
 
+class TestLinksScaling(TestCase):
+    """Layout and path generation have to stay roughly linear - these would take
+    minutes with a quadratic implementation
+    """
+
+    sizes = [10, 1000, 50000]
+
+    def setUp(self):
+        GraphConstants.NODE_HEIGHT = 80
+        GraphConstants.NODE_WIDTH = 200
+        GraphConstants.NODE_SPACING_FACTOR = 2
+        return super().setUp()
+
+    def test_chain_to_coords(self):
+        for size in self.sizes:
+            G = nx.DiGraph()
+            nx.add_path(G, range(size))
+
+            t0 = time.perf_counter()
+            coords = Links.graph_to_coords(G)
+            assert time.perf_counter() - t0 < 10
+
+            assert len(coords) == size
+            assert coords[size - 1] == {"x": 400.0, "y": size * 160.0}
+
+    def test_fan_out_to_coords(self):
+        for size in self.sizes:
+            G = nx.DiGraph()
+            G.add_edges_from((0, i) for i in range(1, size))
+
+            t0 = time.perf_counter()
+            coords = Links.graph_to_coords(G)
+            assert time.perf_counter() - t0 < 10
+
+            assert coords[0] == {"x": size * 200.0, "y": 160.0}
+            assert {c["y"] for n, c in coords.items() if n} == {320.0}
+
+    def test_lattice_to_coords(self):
+        for size in self.sizes:
+            # Each node links to the next two, so node i sits on level i
+            G = nx.DiGraph()
+            G.add_edges_from((i, i + 1) for i in range(size - 1))
+            G.add_edges_from((i, i + 2) for i in range(size - 2))
+
+            t0 = time.perf_counter()
+            coords = Links.graph_to_coords(G)
+            assert time.perf_counter() - t0 < 10
+
+            assert [coords[i]["y"] for i in range(size)] == [
+                (i + 1) * 160.0 for i in range(size)
+            ]
+
+    def test_chain_to_paths(self):
+        for size in self.sizes:
+            G = nx.DiGraph()
+            nx.add_path(G, range(size))
+
+            t0 = time.perf_counter()
+            paths = Links.graph_to_efficient_representation(G)
+            assert time.perf_counter() - t0 < 10
+
+            assert paths == [list(range(size))]
+
+    def test_random_dag_to_paths(self):
+        for size in self.sizes:
+            G = nx.fast_gnp_random_graph(size, 5 / size, seed=1, directed=True)
+            G = nx.DiGraph([(u, v) for u, v in G.edges if u < v])
+
+            t0 = time.perf_counter()
+            paths = Links.graph_to_efficient_representation(G)
+            assert time.perf_counter() - t0 < 10
+
+            # Every edge is covered exactly once, using the minimum number of paths
+            edges = [edge for path in paths for edge in zip(path[:-1], path[1:])]
+            assert sorted(edges) == sorted(G.edges)
+            assert len(paths) == sum(
+                max(0, G.out_degree(n) - G.in_degree(n)) for n in G.nodes
+            )
+
+
+class TestTaskNaming(TestCase):
+    @staticmethod
+    def tasks(*task_ids):
+        return [
+            TaskHandler(
+                str(i),
+                "BashOperator",
+                "airflow.operators.bash_operator",
+                {"task_id": {"value": task_id}},
+            )
+            for i, task_id in enumerate(task_ids)
+        ]
+
+    def test_fix_task_names(self):
+        tasks = DagHandler.fix_task_names(
+            self.tasks("a", "A", "a_0", "1a", "a_1", "TaskA", "task-a")
+        )
+        assert [t.snake_name for t in tasks] == [
+            "a",
+            "a_0",
+            "a_0_0",
+            "a_1",
+            "a_1_0",
+            "task_a",
+            "task_a_0",
+        ]
+
+    def test_fix_task_names_fails_on_duplicate_ids(self):
+        with self.assertRaises(DagHandlerValidationError):
+            DagHandler.fix_task_names(self.tasks("a", "b", "a"))
+
+    def test_fix_task_names_scaling(self):
+        # Leading digits are stripped, so every task is named task
+        size = 50000
+        tasks = self.tasks(*("{}task".format(i) for i in range(size)))
+
+        t0 = time.perf_counter()
+        DagHandler.fix_task_names(tasks)
+        assert time.perf_counter() - t0 < 10
+        assert [t.snake_name for t in tasks] == ["task"] + [
+            "task_{}".format(i) for i in range(size - 1)
+        ]
+
+
 class TestTaskMarshalling(Fixture):
     def test_task_marshall_from_node(self):
         nodes: dict = self.valid_wml_dict["nodes"]
@@ -11,6 +11,7 @@ from windmill.models.dags.dag_handler import (
     TaskHandler,
     Links,
 )
+from windmill.models.dags.dag_importer import import_dag_files
 from windmill.tasks.init import CreateProject
 
 from . import test_datafiles
@@ -42,3 +43,22 @@ class TestDagToDagHandler(Fixture):
 
         assert len(dags) == 1
         # assert dags[0].dag_id == "ValidDag"
+
+
+class TestImportDagFiles(Fixture):
+    def test_import_dag_files(self):
+        with open(os.path.join(self.conf.dags_dir, "broken.py"), "w") as f:
+            f.write("raise RuntimeError('broken')")
+        with open(os.path.join(self.conf.dags_dir, "slow.py"), "w") as f:
+            f.write("import time\ntime.sleep(60)")
+
+        res = import_dag_files(
+            ["valid.py", "broken.py", "slow.py"], self.conf, processes=2, timeout=10
+        )
+
+        assert [r["name"] for r in res] == ["valid.py", "broken.py", "slow.py"]
+        assert res[0]["error"] is None
+        assert res[0]["wml_files"] == ["valid.wml"]
+        assert os.listdir(self.conf.wml_dir) == ["valid.wml"]
+        assert "broken" in res[1]["error"]
+        assert "Timed out" in res[2]["error"]
@@ -1,15 +1,20 @@
 import logging
+import os
 import re
-from unittest import TestCase
+import tempfile
+from unittest import TestCase, mock
 
+from airflow.models.dag import DAG
 from airflow.operators.bash_operator import BaseOperator, BashOperator
 from airflow.operators.python_operator import PythonVirtualenvOperator
 from airflow.operators.sensors import S3KeySensor
+from docstring_parser import parse
 
 from windmill.models.schemas.app_schemas import OperatorSchema
+from windmill.models.operators.operator_cache import OperatorCache
 from windmill.models.operators.operator_handler import OperatorHandler
 from windmill.models.operators.operator_index import OperatorIndex
-from windmill.utils.class_parser import ClassParser
+from windmill.utils.class_parser import ClassParser, get_class_spec_cache
 
 
 def test_fix_docstring():
@@ -26,6 +31,36 @@ def test_fix_docstring():
     )
 
 
+def test_parse_docstring_matches_docstring_parser():
+    for cls in OperatorIndex().operator_list + [DAG]:
+        if not cls.__doc__:
+            continue
+        parsed = parse(ClassParser.fix_docstring(cls.__doc__))
+        expected = (
+            parsed.short_description,
+            parsed.long_description,
+            [(p.arg_name, p.type_name, p.description) for p in parsed.params],
+        )
+        assert ClassParser.parse_docstring(cls.__doc__) == expected, cls
+
+
+def test_parse_docstring_fallback():
+    docs = """Summary
+
+    Returns:
+        Some value
+
+    :param x: first
+    :type x: list of str
+    :param  y: second
+    """
+    assert ClassParser.parse_docstring(docs) == (
+        "Summary",
+        "Returns:\n    Some value",
+        [("x", "list", "first"), ("y", None, "second")],
+    )
+
+
 class TestOperatorMarshalling(TestCase):
     test_input = {
         "type": "bool-param",
@@ -93,3 +128,181 @@ class TestOperatorIndex(TestCase):
                 except AssertionError as e:
                     logging.info(op)
                     raise e
+
+    def test_parallel_operator_list_matches_serial(self):
+        serial = OperatorIndex().marshall_operator_list()
+        parallel = OperatorIndex(processes=2).marshall_operator_list()
+        assert parallel == serial
+
+    def test_operators_by_type(self):
+        oi = OperatorIndex()
+        bash = oi.get_marshalled_operator("BashOperator")
+        assert bash["properties"]["module"] == "airflow.operators.bash_operator"
+        assert oi.get_marshalled_operator("NotAnOperator") is None
+
+        # Lookups are copies, so the index can't be modified through them
+        bash["properties"]["parameters"][0]["value"] = "echo 1"
+        assert (
+            "value"
+            not in oi.operators_by_type["BashOperator"]["properties"]["parameters"][0]
+        )
+
+    def test_marshall_operator_parses_each_class_once(self):
+        oi = OperatorIndex()
+        with mock.patch.object(
+            OperatorHandler, "from_operator", wraps=OperatorHandler.from_operator
+        ) as from_operator:
+            first = oi.marshall_operator(BashOperator)
+            first["id"] = "modified"
+            second = oi.marshall_operator(BashOperator)
+            from_operator.assert_called_once_with(BashOperator)
+
+        assert "id" not in second
+        assert second == OperatorHandler.from_operator(BashOperator).dump()
+
+    def test_class_specs_parsed_once(self):
+        cache = get_class_spec_cache()
+        cache.clear()
+
+        _, first = ClassParser.parse_class(BashOperator, inherit_until=BaseOperator)
+        assert cache.stats() == {"hits": 0, "misses": 2, "classes": 2}
+
+        first["parameters"][0]["value"] = "echo 1"
+        _, second = ClassParser.parse_class(BashOperator, inherit_until=BaseOperator)
+        assert cache.stats()["hits"] == 1
+        assert "value" not in second["parameters"][0]
+
+
+class TestOperatorCache(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(self.tmpdir.name, "operators.json")
+        return super().setUp()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_cold_start_writes_cache(self):
+        oi = OperatorIndex(cache_file=self.cache_file)
+        operators = oi.marshalled_operators
+        assert os.path.exists(self.cache_file)
+
+        cache = OperatorCache(self.cache_file)
+        assert cache.load(cache.cache_key()) == operators
+
+    def test_warm_start_skips_marshalling(self):
+        operators = OperatorIndex(cache_file=self.cache_file).marshalled_operators
+
+        oi = OperatorIndex(cache_file=self.cache_file)
+        with mock.patch.object(OperatorIndex, "marshall_operator_list") as marshall:
+            assert oi.marshalled_operators == operators
+            marshall.assert_not_called()
+        assert oi._operator_list is None
+
+    def test_cache_invalidated_on_version_change(self):
+        OperatorIndex(cache_file=self.cache_file).marshalled_operators
+
+        fingerprint = OperatorCache.fingerprint()
+        fingerprint["windmill"] = "not-a-version"
+        with mock.patch.object(OperatorCache, "fingerprint", return_value=fingerprint):
+            oi = OperatorIndex(cache_file=self.cache_file)
+            with mock.patch.object(
+                OperatorIndex, "marshall_operator_list", return_value=[]
+            ) as marshall:
+                assert oi.marshalled_operators == []
+                marshall.assert_called_once()
+
+        cache = OperatorCache(self.cache_file)
+        assert cache.load(cache.cache_key()) is None
+        assert cache.load(OperatorCache.cache_key(fingerprint)) == []
+
+
+CUSTOM_OPERATOR = '''
+from airflow.operators import BaseOperator
+
+
+class {name}(BaseOperator):
+    """A custom operator
+
+    :param greeting: What to say
+    :type greeting: str
+    """
+
+    def __init__(self, greeting="hello", *args, **kwargs):
+        super().__init__(*args, **kwargs)
+'''
+
+
+class TestCustomOperators(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.oi = OperatorIndex(
+            custom_operators=self.tmpdir.name, custom_refresh_interval=0
+        )
+        return super().setUp()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, filename, contents):
+        with open(os.path.join(self.tmpdir.name, filename), "w") as f:
+            f.write(contents)
+
+    def test_custom_operators_indexed(self):
+        self.write("greeting.py", CUSTOM_OPERATOR.format(name="GreetingOperator"))
+        greeting = self.oi.get_marshalled_operator("GreetingOperator")
+        assert greeting["properties"]["module"] == "greeting"
+        assert greeting["properties"]["parameters"][0]["id"] == "greeting"
+        assert self.oi.get_marshalled_operator("BashOperator")
+
+    def test_incremental_refresh(self):
+        self.write("greeting.py", CUSTOM_OPERATOR.format(name="GreetingOperator"))
+        etag = self.oi.encoded_operators.etags["identity"]
+
+        # Unchanged files aren't re-imported
+        with mock.patch.object(
+            self.oi.custom, "marshall_file", wraps=self.oi.custom.marshall_file
+        ) as marshall_file:
+            assert not self.oi.refresh_custom_operators()
+
+            self.write("farewell.py", CUSTOM_OPERATOR.format(name="FarewellOperator"))
+            assert self.oi.refresh_custom_operators()
+            marshall_file.assert_called_once()
+
+        assert self.oi.encoded_operators.etags["identity"] != etag
+        assert self.oi.get_marshalled_operator("FarewellOperator")
+
+        os.remove(os.path.join(self.tmpdir.name, "farewell.py"))
+        assert self.oi.refresh_custom_operators()
+        assert not self.oi.get_marshalled_operator("FarewellOperator")
+
+    def test_broken_file(self):
+        self.write("broken.py", "raise RuntimeError('broken')")
+        self.write("greeting.py", CUSTOM_OPERATOR.format(name="GreetingOperator"))
+        assert self.oi.get_marshalled_operator("GreetingOperator")
+        assert [op["type"] for op in self.oi.custom.marshalled_operators] == [
+            "GreetingOperator"
+        ]
+
+    def test_refresh_throttled(self):
+        oi = OperatorIndex(
+            custom_operators=self.tmpdir.name, custom_refresh_interval=60
+        )
+        oi.marshalled_operators
+        self.write("greeting.py", CUSTOM_OPERATOR.format(name="GreetingOperator"))
+
+        with mock.patch.object(
+            oi.custom, "refresh", wraps=oi.custom.refresh
+        ) as refresh:
+            assert not oi.refresh_custom_operators()
+            assert not oi.get_marshalled_operator("GreetingOperator")
+            refresh.assert_not_called()
+
+            # Requests don't wait for a scan that's already running
+            oi._custom_refreshed_at -= 60
+            with oi.custom._lock:
+                assert not oi.refresh_custom_operators()
+
+        oi._custom_refreshed_at -= 60
+        assert oi.refresh_custom_operators()
+        assert oi.get_marshalled_operator("GreetingOperator")
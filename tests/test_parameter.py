@@ -0,0 +1,38 @@
+import pickle
+from unittest import TestCase
+
+from windmill.models.dags.parameter import Parameter
+
+
+class TestParameter(TestCase):
+    def setUp(self):
+        self.param = {
+            "id": "bash_command",
+            "type": "str",
+            "description": "The command to run",
+            "required": True,
+            "value": "echo 1",
+        }
+
+    def test_dict_interface(self):
+        param = Parameter.from_dict(self.param)
+        assert param == self.param
+        assert param["value"] == "echo 1"
+        assert param.get("default") is None
+        assert "default" not in param
+
+        param["value"] = "echo 2"
+        assert param.value == "echo 2"
+
+    def test_shared_spec(self):
+        first = Parameter.from_dict(self.param)
+        second = Parameter.from_dict({**self.param, "value": "echo 2"})
+        assert first.spec is second.spec
+
+        second["description"] = "Changed"
+        assert first.spec is not second.spec
+        assert first["description"] == "The command to run"
+
+    def test_pickle(self):
+        param = Parameter.from_dict(self.param)
+        assert pickle.loads(pickle.dumps(param)) == param
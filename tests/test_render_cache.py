@@ -0,0 +1,39 @@
+import os
+import tempfile
+import time
+from unittest import TestCase
+
+from windmill.utils.render_cache import RenderCache
+
+
+class TestRenderCache(TestCase):
+    def test_memory_lru_eviction(self):
+        cache = RenderCache(max_entries=2)
+        cache.put("a", "a = 1")
+        cache.put("b", "b = 1")
+        assert cache.get("a") == "a = 1"  # a is now the most recently used
+
+        cache.put("c", "c = 1")
+        assert cache.get("b") is None
+        assert cache.get("a") == "a = 1"
+        assert cache.get("c") == "c = 1"
+
+    def test_disk_persistence(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            RenderCache(cache_dir=tmpdir).put("a", "a = 1")
+
+            cache = RenderCache(cache_dir=tmpdir)
+            assert cache.get("a") == "a = 1"
+            assert cache.get("b") is None
+
+    def test_disk_lru_eviction(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = RenderCache(max_entries=0, cache_dir=tmpdir, max_disk_entries=2)
+            cache.put("a", "a = 1")
+            cache.put("b", "b = 1")
+            os.utime(os.path.join(tmpdir, "a.py"), (0, 0))
+            os.utime(os.path.join(tmpdir, "b.py"), (1, 1))
+
+            cache.get("a")  # Touches a, so b is evicted next
+            cache.put("c", "c = 1")
+            assert sorted(os.listdir(tmpdir)) == ["a.py", "c.py"]
@@ -0,0 +1,86 @@
+import os
+import subprocess
+import sys
+import tempfile
+from unittest import TestCase
+
+
+# Modules that only commands touching operators, DAGs or the webserver may import
+HEAVY_MODULES = ["airflow", "flask", "black", "networkx", "jinja2", "marshmallow"]
+# Generous budget for the cumulative import time of windmill, in microseconds
+IMPORT_BUDGET_US = 1_500_000
+
+
+def import_times(argv, cwd=None):
+    """Runs the windmill CLI with `python -X importtime`. -X importtime is
+    ignored before Python 3.7, so the modules imported by the CLI are also
+    reported at exit
+
+    Returns:
+        Tuple[List[str], Dict[str, int]]: Imported modules, and the cumulative
+            import time of each in us (empty before 3.7)
+    """
+    # Resolved like the console script entry point, windmill:cli.cli.Cli.run_cli
+    code = (
+        "import sys, windmill; "
+        f"sys.argv = ['windmill'] + {argv!r}\n"
+        "try:\n"
+        "    windmill.cli.cli.Cli.run_cli()\n"
+        "finally:\n"
+        "    print('modules:', ' '.join(sorted(sys.modules)), file=sys.stderr)"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([root] + sys.path))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+
+    modules, times = [], {}
+    for line in proc.stderr.splitlines():
+        if line.startswith("modules:"):
+            modules = line.split()[1:]
+        elif line.startswith("import time:") and "|" in line:
+            _, cumulative, module = line[len("import time:") :].split("|")
+            if cumulative.strip().isdigit():
+                times[module.strip()] = int(cumulative)
+    return modules, times
+
+
+class TestStartup(TestCase):
+    def assert_light(self, modules, times):
+        assert "windmill.cli.cli" in modules
+        heavy = [m for m in modules if m.split(".")[0] in HEAVY_MODULES]
+        assert not heavy, f"Imported {sorted(heavy)}"
+        if times:
+            assert times["windmill"] < IMPORT_BUDGET_US
+
+    def test_help(self):
+        commands = [
+            [],
+            ["init"],
+            ["run"],
+            ["compile"],
+            ["build"],
+            ["import"],
+            ["watch"],
+        ]
+        for command in commands:
+            with self.subTest(command=command):
+                self.assert_light(*import_times(command + ["--help"]))
+
+    def test_init(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.assert_light(*import_times(["init", "--name", "test"], cwd=tmpdir))
+            assert os.path.exists(os.path.join(tmpdir, "test"))
+
+    def test_noop_build(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            import_times(["init", "--name", "test"], cwd=tmpdir)
+            project = os.path.join(tmpdir, "test")
+            self.assert_light(*import_times(["build"], cwd=project))
+            assert os.path.exists(os.path.join(project, ".windmill", "build.json"))
@@ -0,0 +1,50 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from windmill.utils.wml_cache import WmlCache
+
+
+class TestWmlCache(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = WmlCache(max_entries=2)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, name, contents, mtime=None):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "w") as f:
+            f.write(contents)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+        return path
+
+    def test_read_through(self):
+        path = self.write("a.wml", '{"a": 1}')
+        raw = self.cache.get_raw(path)
+        assert raw == b'{"a": 1}'
+        assert self.cache.get_raw(path) is raw  # Served without re-reading
+
+    def test_external_edits(self):
+        path = self.write("a.wml", '{"a": 1}', mtime=1)
+        assert self.cache.get_raw(path) == b'{"a": 1}'
+
+        self.write("a.wml", '{"a": 2}', mtime=2)
+        assert self.cache.get_raw(path) == b'{"a": 2}'
+
+        os.remove(path)
+        with self.assertRaises(FileNotFoundError):
+            self.cache.get_raw(path)
+
+    def test_lru_eviction(self):
+        paths = [self.write(f"{n}.wml", "{}") for n in "abc"]
+        for path in paths:
+            self.cache.get_raw(path)
+        assert list(self.cache._entries) == paths[1:]
+
+    def test_invalid_json(self):
+        path = self.write("a.wml", "not json")
+        with self.assertRaises(ValueError):
+            self.cache.get_raw(path)
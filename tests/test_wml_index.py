@@ -0,0 +1,77 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from windmill.utils.wml_index import WmlIndex
+
+from . import test_datafiles
+
+
+class TestWmlIndex(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.index = WmlIndex(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, name, contents):
+        with open(os.path.join(self.tmpdir.name, name), "w") as f:
+            f.write(contents)
+
+    def test_metadata(self):
+        self.write("Valid.wml", test_datafiles["Valid.wml"])
+        self.write("broken.wml", "not json")
+
+        total, wmls = self.index.list_wmls()
+        assert total == 2
+        valid, broken = wmls
+        wml = json.loads(test_datafiles["Valid.wml"])
+        assert valid["dag_id"] == "ValidDag"
+        assert valid["nodes"] == len(wml["nodes"])
+        assert valid["links"] == len(wml["links"])
+        assert valid["size"] == len(test_datafiles["Valid.wml"].encode())
+        assert valid["hash"]
+        assert broken["name"] == "broken.wml"
+        assert broken["dag_id"] is None
+
+    def test_incremental_refresh(self):
+        self.write("a.wml", "{}")
+        self.write("b.wml", "{}")
+        self.index.refresh()
+        first = self.index._entries["a.wml"]
+
+        self.write("b.wml", test_datafiles["Valid.wml"])
+        os.remove(os.path.join(self.tmpdir.name, "a.wml"))
+        self.write("c.wml", "{}")
+
+        _, wmls = self.index.list_wmls()
+        assert [w["name"] for w in wmls] == ["b.wml", "c.wml"]
+        assert wmls[0]["dag_id"] == "ValidDag"
+
+        self.write("a.wml", "{}")
+        self.index.refresh()
+        assert self.index._entries["a.wml"] is not first
+        entry = self.index._entries["c.wml"]
+        self.index.refresh()
+        assert self.index._entries["c.wml"] is entry  # Unchanged files aren't re-read
+
+    def test_sort_filter_and_paginate(self):
+        for i in range(5):
+            self.write(f"dag_{i}.wml", "x" * (5 - i))
+        self.write("other.wml", "x" * 10)
+
+        total, wmls = self.index.list_wmls(prefix="dag_", sort="size", limit=2)
+        assert total == 5
+        assert [w["name"] for w in wmls] == ["dag_4.wml", "dag_3.wml"]
+
+        _, wmls = self.index.list_wmls(sort="size", descending=True, offset=1, limit=2)
+        assert [w["name"] for w in wmls] == ["dag_0.wml", "dag_1.wml"]
+
+        # Missing values always sort last
+        _, wmls = self.index.list_wmls(sort="dag_id", descending=True)
+        assert len(wmls) == 6
+
+        with self.assertRaises(ValueError):
+            self.index.list_wmls(sort="hash")
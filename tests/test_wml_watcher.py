@@ -0,0 +1,94 @@
+import os
+import tempfile
+import threading
+import time
+from unittest import TestCase
+
+from windmill.utils.wml_watcher import WmlWatcher
+
+
+class TestWmlWatcher(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.write("existing.wml", "{}", mtime=1)
+        self.batches = []
+        self.watcher = WmlWatcher(
+            self.tmpdir.name, self.batches.append, debounce=0.01, notifications=False
+        )
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, name, contents, mtime=None):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "w") as f:
+            f.write(contents)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+        return path
+
+    def handle_events(self):
+        pending = {}
+        while not self.watcher._events.empty():
+            name, seen = self.watcher._events.get()
+            pending.setdefault(name, seen)
+        self.watcher._flush(pending)
+
+    def test_poll(self):
+        self.watcher.poll()
+        self.handle_events()
+        assert self.batches == []
+
+        self.write("existing.wml", '{"a": 1}', mtime=2)
+        self.write("new.wml", "{}")
+        self.watcher.poll()
+        self.handle_events()
+        assert len(self.batches) == 1
+        assert sorted(self.batches[0]) == ["existing.wml", "new.wml"]
+
+    def test_coalesce(self):
+        for i in range(3):
+            self.write("existing.wml", f'{{"a": {i}}}', mtime=i + 2)
+            self.watcher.notify("existing.wml")
+        self.handle_events()
+        assert len(self.batches) == 1
+        assert list(self.batches[0]) == ["existing.wml"]
+
+    def test_unchanged_dropped(self):
+        self.watcher.notify("existing.wml")
+        self.watcher.notify("missing.wml")
+        self.handle_events()
+        assert self.batches == []
+
+    def test_deleted(self):
+        os.remove(os.path.join(self.tmpdir.name, "existing.wml"))
+        self.watcher.poll()
+        self.handle_events()
+        assert list(self.batches[0]) == ["existing.wml"]
+        assert self.watcher.snapshot() == {}
+
+    def test_poll_unchanged_not_renotified(self):
+        self.write("existing.wml", '{"a": 1}', mtime=2)
+        self.watcher.poll()
+        self.watcher.poll()
+        assert self.watcher._events.qsize() == 1
+
+    def test_poll_faster_than_debounce(self):
+        watcher = WmlWatcher(
+            self.tmpdir.name,
+            self.batches.append,
+            debounce=0.2,
+            poll_interval=0.01,
+            notifications=False,
+        )
+        thread = threading.Thread(target=watcher.run, daemon=True)
+        thread.start()
+        try:
+            self.write("existing.wml", '{"a": 1}', mtime=2)
+            deadline = time.monotonic() + 5
+            while not self.batches and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert [list(batch) for batch in self.batches] == [["existing.wml"]]
+        finally:
+            watcher.stop()
+            thread.join(5)
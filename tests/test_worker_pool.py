@@ -0,0 +1,93 @@
+import os
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from windmill.exceptions import WorkerTimeoutError
+from windmill.utils.validation_pool import init_validation_pool, validate_py_code
+from windmill.utils.worker_pool import WorkerPool
+
+
+def _ignore_sigterm():
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+
+class TestWorkerPool(TestCase):
+    def setUp(self):
+        # Spawned workers need a valid working directory, and other tests may
+        # leave us in a deleted temp dir
+        os.chdir(os.path.dirname(__file__))
+        self.pool = WorkerPool(processes=1, timeout=10, max_jobs_per_worker=2)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_runs_in_worker(self):
+        assert self.pool.run(os.getpid) != os.getpid()
+        assert self.pool.run(divmod, 7, 2) == (3, 1)
+
+    def test_exceptions_are_reraised(self):
+        with self.assertRaises(ValueError):
+            self.pool.run(int, "x")
+        assert self.pool.run(int, "1") == 1
+
+    def test_workers_are_recycled(self):
+        first = self.pool.run(os.getpid)
+        assert self.pool.run(os.getpid) == first
+        assert self.pool.run(os.getpid) != first
+
+    def test_timeout_kills_worker(self):
+        first = self.pool.run(os.getpid)
+
+        t0 = time.time()
+        with self.assertRaises(WorkerTimeoutError):
+            self.pool.run(time.sleep, 30, timeout=0.5)
+        assert time.time() - t0 < 10
+
+        assert self.pool.run(os.getpid) != first
+
+    def test_timeout_kills_worker_ignoring_sigterm(self):
+        if os.name != "posix":
+            self.skipTest("Needs POSIX signals")
+        first = self.pool.run(os.getpid)
+        self.pool.run(_ignore_sigterm)
+        with self.assertRaises(WorkerTimeoutError):
+            self.pool.run(time.sleep, 30, timeout=0.5)
+        assert self.pool.run(os.getpid) != first
+
+    def test_concurrent_jobs_respect_processes(self):
+        pool = WorkerPool(processes=2, prewarm=False)
+        try:
+            with ThreadPoolExecutor(8) as executor:
+                pids = list(executor.map(lambda _: pool.run(os.getpid), range(32)))
+            assert len(set(pids)) <= 2
+            assert pool._started == 2
+        finally:
+            pool.close()
+        assert pool._started == 0
+
+    def test_memory_limit(self):
+        if os.name != "posix":
+            self.skipTest("Memory limits need the resource module")
+        pool = WorkerPool(processes=1, memory_limit_mb=512, prewarm=False)
+        try:
+            with self.assertRaises(MemoryError):
+                pool.run(bytearray, 1024 * 1024 * 1024)
+            assert pool.run(len, "abc") == 3
+        finally:
+            pool.close()
+
+
+class TestValidationPool(TestCase):
+    def setUp(self):
+        os.chdir(os.path.dirname(__file__))
+
+    def tearDown(self):
+        init_validation_pool()
+
+    def test_validate_on_pool(self):
+        init_validation_pool(processes=1, timeout=60)
+        validate_py_code("import datetime\nx = datetime.date(2020, 1, 1)")
+        with self.assertRaises(NameError):
+            validate_py_code("x = undefined_name")
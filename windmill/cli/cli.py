@@ -8,12 +8,15 @@ from decli import cli
 from doccli import DocCliParser
 
 import windmill
+from ..config.build_config import BuildConfig
+from ..config.compile_config import CompileConfig
+from ..config.import_config import ImportConfig
 from ..config.project_config import ProjectConfig
 from ..config.run_config import RunConfig
+from ..config.watch_config import WatchConfig
 from ..constants import ProjectDefaults
-from ..http.api.endpoints import app
 from ..tasks.init import CreateProject
-from ..tasks.run import StartWebserver
+from ..utils.import_handler import import_airflow
 
 
 def run_parser(parser: DocCliParser):
@@ -58,15 +61,66 @@ class Cli:
             if save_config:
                 logging.info("Updating config")
 
+            import_airflow()
+            from ..tasks.run import StartWebserver
+
             StartWebserver(run_config)
         except Exception as e:
             logging.error(f"Unable to start webserver ({e}) - aborting")
+            return e
+
+    @classmethod
+    def compile(cls, save_config, *args, **kwargs):
+        try:
+            import_airflow()
+            from ..tasks.compile import CompileDags
+
+            CompileDags(CompileConfig(*args, **kwargs))
+        except Exception as e:
+            logging.error(f"Unable to compile DAGs ({e}) - aborting")
+            return e
+
+    @classmethod
+    def build(cls, save_config, *args, **kwargs):
+        try:
+            from ..tasks.build import BuildProject
+
+            return BuildProject(BuildConfig(*args, **kwargs))
+        except Exception as e:
+            logging.error(f"Unable to build project ({e}) - aborting")
+            return e
+
+    @classmethod
+    def import_dags(cls, save_config, *args, **kwargs):
+        try:
+            import_airflow()
+            from ..tasks.import_dags import ImportDags
+
+            return ImportDags(ImportConfig(*args, **kwargs))
+        except Exception as e:
+            logging.error(f"Unable to import DAGs ({e}) - aborting")
+            return e
+
+    @classmethod
+    def watch(cls, save_config, *args, **kwargs):
+        try:
+            import_airflow()
+            from ..tasks.watch import WatchProject
+
+            WatchProject(WatchConfig(*args, **kwargs))
+        except Exception as e:
+            logging.error(f"Unable to watch project ({e}) - aborting")
+            return e
 
     @classmethod
     def get_parser(cls):
         parser = DocCliParser(cls)
         parser.add_subcommand(ProjectConfig, func=cls.init)
         parser.add_subcommand(RunConfig, func=cls.run_server)
+        parser.add_subcommand(CompileConfig, func=cls.compile)
+        parser.add_subcommand(BuildConfig, func=cls.build)
+        parser.add_subcommand(ImportConfig, func=cls.import_dags)
+        parser.add_subcommand(WatchConfig, func=cls.watch)
 
         return parser
 
@@ -136,6 +190,9 @@ class DevCli:
                     )
                 )
                 run_config = RunConfig(_run_dev_server=True, *args, **kwargs)
+                import_airflow()
+                from ..tasks.run import StartWebserver
+
                 StartWebserver(run_config)
             except Exception as e:
                 logging.error(f"Unable to start webserver ({e}) - aborting")
@@ -1,2 +1,6 @@
+from .build_config import BuildConfig
+from .compile_config import CompileConfig
+from .import_config import ImportConfig
 from .project_config import ProjectConfig
 from .run_config import RunConfig
+from .watch_config import WatchConfig
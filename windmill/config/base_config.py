@@ -0,0 +1,9 @@
+class ProjectConfigMixin:
+    """Loads the project config for commands that take a conf_file"""
+
+    @property
+    def project_conf(self):
+        # Imported here as project_config imports the command configs
+        from .project_config import ProjectConfig
+
+        return ProjectConfig.from_conf_file(self.conf_file)
@@ -0,0 +1,29 @@
+from doccli import ConfigUtil
+
+from .base_config import ProjectConfigMixin
+from ..constants import ServerDefaults
+
+
+class BuildConfig(ProjectConfigMixin, ConfigUtil):
+    command_name = "build"
+    config_key = "build.config"
+
+    def __init__(
+        self,
+        workers: int = None,
+        conf_file: str = ServerDefaults.PROJECT_CONF,
+        codegen_backend: str = ServerDefaults.CODEGEN_BACKEND,
+    ):
+        """Compile every changed WML in a windmill project to a Python DAG, and
+        remove DAGs whose WML was deleted
+        
+        Args:
+            workers (int): Number of processes to compile on. Defaults to one
+                           per CPU, 0 to compile serially
+            conf_file (str): Name of config file in this directory
+            codegen_backend (str): DAG code generator - `jinja` (Jinja + Black)
+                                   or `emitter` (pre-formatted, no Black pass)
+        """
+        self.workers = workers
+        self.conf_file = conf_file
+        self.codegen_backend = codegen_backend
@@ -0,0 +1,38 @@
+from doccli import ConfigUtil
+
+from .base_config import ProjectConfigMixin
+from ..constants import ServerDefaults
+
+
+class CompileConfig(ProjectConfigMixin, ConfigUtil):
+    command_name = "compile"
+    config_key = "compile.config"
+
+    @property
+    def wml_list(self):
+        if not self.wmls:
+            return None
+        return [w.strip() for w in self.wmls.split(",") if w.strip()]
+
+    def __init__(
+        self,
+        wmls: str = None,
+        workers: int = ServerDefaults.COMPILE_WORKERS,
+        conf_file: str = ServerDefaults.PROJECT_CONF,
+        codegen_backend: str = ServerDefaults.CODEGEN_BACKEND,
+    ):
+        """Compile WMLs in a windmill project to Python DAGs
+        
+        Args:
+            wmls (str): Comma separated list of WML filenames. Defaults to every
+                        WML in the project
+            workers (int): Number of processes to compile on. Defaults to 0
+                           (compile serially)
+            conf_file (str): Name of config file in this directory
+            codegen_backend (str): DAG code generator - `jinja` (Jinja + Black)
+                                   or `emitter` (pre-formatted, no Black pass)
+        """
+        self.wmls = wmls
+        self.workers = workers
+        self.conf_file = conf_file
+        self.codegen_backend = codegen_backend
@@ -0,0 +1,37 @@
+from doccli import ConfigUtil
+
+from .base_config import ProjectConfigMixin
+from ..constants import ServerDefaults
+
+
+class ImportConfig(ProjectConfigMixin, ConfigUtil):
+    command_name = "import"
+    config_key = "import.config"
+
+    @property
+    def dag_list(self):
+        if not self.dags:
+            return None
+        return [d.strip() for d in self.dags.split(",") if d.strip()]
+
+    def __init__(
+        self,
+        dags: str = None,
+        workers: int = None,
+        timeout: int = ServerDefaults.IMPORT_TIMEOUT,
+        conf_file: str = ServerDefaults.PROJECT_CONF,
+    ):
+        """Convert existing Python DAG files in a windmill project to WMLs
+        
+        Args:
+            dags (str): Comma separated list of Python filenames in the dags
+                        folder. Defaults to every Python file in the folder
+            workers (int): Number of processes to import on. Defaults to one
+                           per CPU
+            timeout (int): Seconds a file may take to import before it is killed
+            conf_file (str): Name of config file in this directory
+        """
+        self.dags = dags
+        self.workers = workers
+        self.timeout = timeout
+        self.conf_file = conf_file
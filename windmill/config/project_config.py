@@ -1,3 +1,5 @@
+import os
+
 from doccli import ConfigUtil
 
 from .run_config import RunConfig
@@ -17,6 +19,7 @@ class ProjectConfig(ConfigUtil):
         wml_dir: str = ProjectDefaults.WML_FOLDER,
         dags_dir: str = ProjectDefaults.DAGS_FOLDER,
         operators_dir: str = ProjectDefaults.OPERATORS_FOLDER,
+        cache_dir: str = ProjectDefaults.CACHE_FOLDER,
         _conf_file: str = ProjectDefaults.PROJECT_CONF,
         *args,
         **kwargs,
@@ -29,6 +32,7 @@ class ProjectConfig(ConfigUtil):
             wml_dir (str): Folder to store windmill WML files
             dags_dir (str): Folder to store generated YML DAG files
             operators_dir (str): Folder to store custom operator files
+            cache_dir (str): Folder to store Windmill build caches
             conf_file (str, optional): Default project config filename. Defaults to ProjectDefaults.PROJECT_CONF.
         """
         super().__init__(*args, **kwargs)
@@ -38,8 +42,21 @@ class ProjectConfig(ConfigUtil):
         self.wml_dir = wml_dir
         self.dags_dir = dags_dir
         self.operators_dir = operators_dir
+        self.cache_dir = cache_dir
         self.conf_file = _conf_file
 
+    @property
+    def operator_cache_file(self):
+        return os.path.join(self.cache_dir, ProjectDefaults.OPERATOR_CACHE_FILE)
+
+    @property
+    def render_cache_dir(self):
+        return os.path.join(self.cache_dir, ProjectDefaults.RENDER_CACHE_FOLDER)
+
+    @property
+    def build_manifest_file(self):
+        return os.path.join(self.cache_dir, ProjectDefaults.BUILD_MANIFEST_FILE)
+
     @property
     def run_config(self):
         return self.subconfigs[RunConfig.config_key]
@@ -1,23 +1,32 @@
 from doccli import ConfigUtil
 
+from .base_config import ProjectConfigMixin
 from ..constants import ServerDefaults
 
 
-class RunConfig(ConfigUtil):
+class RunConfig(ProjectConfigMixin, ConfigUtil):
     command_name = "run"
     config_key = "webserver.config"
 
-    @property
-    def project_conf(self):
-        from .project_config import ProjectConfig
-
-        return ProjectConfig.from_conf_file(self.conf_file)
-
     def __init__(
         self,
         port: int = ServerDefaults.HOST_PORT,
         hostname: str = ServerDefaults.HOST_ADDRESS,
         conf_file: str = ServerDefaults.PROJECT_CONF,
+        server_workers: int = ServerDefaults.SERVER_WORKERS,
+        server_threads: int = ServerDefaults.SERVER_THREADS,
+        keep_alive: int = ServerDefaults.KEEP_ALIVE,
+        request_timeout: int = ServerDefaults.REQUEST_TIMEOUT,
+        index_workers: int = ServerDefaults.INDEX_WORKERS,
+        render_cache_size: int = ServerDefaults.RENDER_CACHE_SIZE,
+        render_cache_disk_size: int = ServerDefaults.RENDER_CACHE_DISK_SIZE,
+        codegen_backend: str = ServerDefaults.CODEGEN_BACKEND,
+        validation_workers: int = ServerDefaults.VALIDATION_WORKERS,
+        validation_timeout: int = ServerDefaults.VALIDATION_TIMEOUT,
+        validation_memory_mb: int = ServerDefaults.VALIDATION_MEMORY_MB,
+        validation_max_jobs: int = ServerDefaults.VALIDATION_MAX_JOBS,
+        compile_workers: int = ServerDefaults.COMPILE_WORKERS,
+        wml_cache_size: int = ServerDefaults.WML_CACHE_SIZE,
         _run_dev_server=False,
     ):
         """Serve Windmill from a windmill project
@@ -26,6 +35,33 @@ class RunConfig(ConfigUtil):
             port (int): Bind Port
             hostname (str): Bind address 
             conf_file (str): Name of config file in this directory
+            server_workers (int): Number of Gunicorn worker processes. Defaults
+                                  to 0 (single process Flask server)
+            server_threads (int): Number of threads per Gunicorn worker
+            keep_alive (int): Seconds to hold idle keep-alive connections open
+            request_timeout (int): Seconds a Gunicorn worker may spend on a
+                                   request before it is restarted
+            index_workers (int): Number of processes used to build the operator
+                                 index. Defaults to 0 (build serially)
+            render_cache_size (int): Number of rendered DAGs to keep in memory
+            render_cache_disk_size (int): Number of rendered DAGs to persist in
+                                          the project cache. 0 to disable
+            codegen_backend (str): DAG code generator - `jinja` (Jinja + Black)
+                                   or `emitter` (pre-formatted, no Black pass)
+            validation_workers (int): Number of worker processes used to
+                                      validate rendered DAGs, per server
+                                      worker. Defaults to 0 (validate in the
+                                      server process)
+            validation_timeout (int): Seconds a DAG may take to validate before
+                                      its worker is killed
+            validation_memory_mb (int): Memory limit for each validation
+                                        worker. 0 for no limit
+            validation_max_jobs (int): Validation workers are recycled after
+                                       this many DAGs
+            compile_workers (int): Number of processes used by the batch
+                                   compile endpoint. Defaults to 0 (compile
+                                   serially)
+            wml_cache_size (int): Number of WML documents to keep in memory
             _run_dev_server (bool, optional): If True will run back-end with 
                                               CORS on Flask (No Gunicorn). 
                                               Defaults to False.
@@ -33,4 +69,18 @@ class RunConfig(ConfigUtil):
         self.port = port
         self.hostname = hostname
         self.conf_file = conf_file
+        self.server_workers = server_workers
+        self.server_threads = server_threads
+        self.keep_alive = keep_alive
+        self.request_timeout = request_timeout
+        self.index_workers = index_workers
+        self.render_cache_size = render_cache_size
+        self.render_cache_disk_size = render_cache_disk_size
+        self.codegen_backend = codegen_backend
+        self.validation_workers = validation_workers
+        self.validation_timeout = validation_timeout
+        self.validation_memory_mb = validation_memory_mb
+        self.validation_max_jobs = validation_max_jobs
+        self.compile_workers = compile_workers
+        self.wml_cache_size = wml_cache_size
         self.run_dev_server = _run_dev_server
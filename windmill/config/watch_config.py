@@ -0,0 +1,33 @@
+from doccli import ConfigUtil
+
+from .base_config import ProjectConfigMixin
+from ..constants import ServerDefaults
+
+
+class WatchConfig(ProjectConfigMixin, ConfigUtil):
+    command_name = "watch"
+    config_key = "watch.config"
+
+    def __init__(
+        self,
+        debounce_ms: int = ServerDefaults.WATCH_DEBOUNCE_MS,
+        poll_interval_ms: int = ServerDefaults.WATCH_POLL_INTERVAL_MS,
+        conf_file: str = ServerDefaults.PROJECT_CONF,
+        codegen_backend: str = ServerDefaults.CODEGEN_BACKEND,
+    ):
+        """Recompile WMLs in a windmill project whenever they change
+        
+        Args:
+            debounce_ms (int): Milliseconds without changes before changed WMLs
+                               are compiled
+            poll_interval_ms (int): Milliseconds between scans of the WML
+                                    folder, if the watchdog extra isn't
+                                    installed
+            conf_file (str): Name of config file in this directory
+            codegen_backend (str): DAG code generator - `jinja` (Jinja + Black)
+                                   or `emitter` (pre-formatted, no Black pass)
+        """
+        self.debounce_ms = debounce_ms
+        self.poll_interval_ms = poll_interval_ms
+        self.conf_file = conf_file
+        self.codegen_backend = codegen_backend
@@ -4,11 +4,35 @@ class ProjectDefaults:
     WML_FOLDER = "wmls"
     DAGS_FOLDER = "dags"
     OPERATORS_FOLDER = "custom_operators"
+    CACHE_FOLDER = ".windmill"
+    OPERATOR_CACHE_FILE = "operators.json"
+    RENDER_CACHE_FOLDER = "render"
+    BUILD_MANIFEST_FILE = "build.json"
 
 
 class ServerDefaults:
     HOST_ADDRESS = "localhost"
     HOST_PORT = 8000
+    SERVER_WORKERS = 0
+    SERVER_THREADS = 1
+    KEEP_ALIVE = 2
+    REQUEST_TIMEOUT = 60
+    INDEX_WORKERS = 0
+    CUSTOM_OPERATORS_REFRESH_MS = 1000
+    RENDER_CACHE_SIZE = 128
+    RENDER_CACHE_DISK_SIZE = 1024
+    CODEGEN_BACKEND = "jinja"
+    VALIDATION_WORKERS = 0
+    VALIDATION_TIMEOUT = 30
+    VALIDATION_MEMORY_MB = 0
+    VALIDATION_MAX_JOBS = 100
+    COMPILE_WORKERS = 0
+    IMPORT_TIMEOUT = 60
+    WATCH_DEBOUNCE_MS = 300
+    WATCH_POLL_INTERVAL_MS = 1000
+    WML_CACHE_SIZE = 256
+    WML_PAGE_SIZE = 100
+    WML_MAX_PAGE_SIZE = 1000
     PROJECT_CONF = ProjectDefaults.PROJECT_CONF
 
 
@@ -12,3 +12,11 @@ class InitError(Exception):
 
 class DagHandlerValidationError(Exception):
     ...
+
+
+class WorkerError(Exception):
+    ...
+
+
+class WorkerTimeoutError(WorkerError):
+    ...
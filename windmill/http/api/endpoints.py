@@ -1,17 +1,24 @@
 import json
 import logging
 import os
+import time
 
-from flask import Flask, jsonify, make_response, request, send_from_directory
+from flask import Flask, Response, jsonify, make_response, request, send_from_directory
 from flask_cors import CORS
-from marshmallow import EXCLUDE
-from marshmallow.exceptions import ValidationError
 
 from ...config.project_config import ProjectConfig
-from ...exceptions import DagHandlerValidationError
+from ...constants import ServerDefaults
+from ...models.dags.dag_compiler import compile_wml, compile_wmls, init_compile_pool
 from ...models.dags.dag_handler import DagHandler
-from ...models.operators.operator_index import get_operator_index
+from ...models.operators.operator_index import get_operator_index, init_operator_index
 from ...models.schemas.app_schemas import OperatorSchema, MinimalWmlSchema
+from ...utils.encoded_payload import EncodedPayload
+from ...utils.file_utils import is_plain_filename
+from ...utils.import_handler import add_import_path
+from ...utils.render_cache import init_render_cache
+from ...utils.validation_pool import init_validation_pool
+from ...utils.wml_cache import get_wml_cache, init_wml_cache
+from ...utils.wml_index import get_wml_index, init_wml_index
 
 
 app = Flask(__name__, static_folder="../app/dist/")
@@ -31,6 +38,25 @@ def serve(path):
 #######################################################################
 # API Endpoints
 #######################################################################
+def encoded_response(payload: EncodedPayload) -> Response:
+    """Serves the best pre-compressed variant of payload the client accepts, or
+    a bodiless 304 if the client's copy is current
+    """
+    encoding = payload.encoding_for(lambda e: request.accept_encodings[e] > 0)
+    etag = payload.etags[encoding]
+
+    if any(request.if_none_match.contains_weak(t) for t in payload.etags.values()):
+        res = Response(status=304)
+    else:
+        res = Response(payload.variants[encoding], mimetype="application/json")
+        if encoding != "identity":
+            res.headers["Content-Encoding"] = encoding
+    res.set_etag(etag)
+    res.headers["Cache-Control"] = "no-cache"
+    res.headers["Vary"] = "Accept-Encoding"
+    return res
+
+
 @app.route("/v1/operators", methods=["GET"])
 def get_operators():
     """Retrieves a JSON list of all available Airflow Operators
@@ -40,7 +66,9 @@ def get_operators():
     """
     logging.info(f"GET /v1/operators")
 
-    return jsonify(get_operator_index().marshalled_operators), 200
+    operator_index = get_operator_index()
+    operator_index.refresh_custom_operators()
+    return encoded_response(operator_index.encoded_operators)
 
 
 @app.route("/v1/wml/", methods=["GET"])
@@ -50,16 +78,47 @@ def get_wmls(name=None):
 
     if name:
         f_path = os.path.join(app.config["project_conf"].wml_dir, name)
-        if os.path.exists(f_path):
-            with open(f_path, "r") as f:
-                data = json.load(f)
-            return jsonify(data), 200
-        else:
+        try:
+            raw = get_wml_cache().get_raw(f_path)
+        except FileNotFoundError:
             return f"File {f_path} not found", 404
+        return Response(raw, mimetype="application/json"), 200
     else:
         return jsonify(os.listdir(app.config["project_conf"].wml_dir)), 200
 
 
+@app.route("/v1/wmls", methods=["GET"])
+def list_wmls():
+    """Pages through WML metadata. Query parameters:
+    - prefix: Only include WMLs whose name starts with prefix
+    - sort: One of wml_index.SORT_KEYS, prefixed with '-' to sort descending
+    - offset, limit: Page bounds. limit is capped at ServerDefaults.WML_MAX_PAGE_SIZE
+
+    Returns:
+        {"total": int, "offset": int, "limit": int, "wmls": List[Dict]}
+    """
+    logging.info(f"GET /v1/wmls")
+
+    sort = request.args.get("sort", "name")
+    descending = sort.startswith("-")
+    try:
+        offset = max(int(request.args.get("offset", 0)), 0)
+        limit = int(request.args.get("limit", ServerDefaults.WML_PAGE_SIZE))
+        limit = min(max(limit, 0), ServerDefaults.WML_MAX_PAGE_SIZE)
+
+        total, wmls = get_wml_index().list_wmls(
+            prefix=request.args.get("prefix", ""),
+            sort=sort.lstrip("-"),
+            descending=descending,
+            offset=offset,
+            limit=limit,
+        )
+    except ValueError as e:
+        return f"Error: {e}", 400
+
+    return jsonify({"total": total, "offset": offset, "limit": limit, "wmls": wmls})
+
+
 @app.route("/v1/wml/<name>", methods=["POST"])
 def post_wml(name):
     logging.info(f"POST /v1/wml/{name}")
@@ -70,6 +129,7 @@ def post_wml(name):
     f_path = os.path.join(app.config["project_conf"].wml_dir, name)
     with open(f_path, "w") as f:
         json.dump(content, f)
+    get_wml_cache().invalidate(f_path)
 
     return "Created", 201
 
@@ -78,53 +138,110 @@ def post_wml(name):
 def get_dagspec():
     logging.info(f"GET /v1/dag/")
 
-    return jsonify(DagHandler.marshall_dag_docstring()), 200
+    return encoded_response(DagHandler.encoded_dag_docstring())
 
 
 @app.route("/v1/dag/<name>", methods=["POST"])
 def post_dag(name):
+    """Compiles the WML in the request body, and saves the WML and DAG only if
+    it compiles
+    """
     logging.info(f"POST /v1/dag/{name}")
 
-    res = post_wml(name)
-    if res[1] == 201:
-        f_path = os.path.join(app.config["project_conf"].wml_dir, name)
-        with open(f_path, "r") as f:
-            wml_dict = json.load(f)
+    wml = request.get_json(silent=True)
+    if not isinstance(wml, dict):
+        return "Expected a JSON object", 400
 
-        try:
-            wml_dict_parsed = MinimalWmlSchema().load(
-                wml_dict, partial=False, unknown=EXCLUDE
-            )
-        except ValidationError as e:
-            logging.exception("Error parsing WML")
-            return "Unable to deserialise WML contents", 400
+    proj_conf = app.config["project_conf"]
+    compiled = compile_wml(name, wml, proj_conf.dags_dir, wml_dir=proj_conf.wml_dir)
+    get_wml_cache().invalidate(os.path.join(proj_conf.wml_dir, name))
+    if compiled["error"]:
+        return compiled["error"], compiled["status"]
 
-        try:
-            dag_handler = DagHandler.load_from_wml(wml_dict_parsed)
-            py_content = dag_handler.to_python()
-        except DagHandlerValidationError as e:
-            logging.exception(f"Unable to convert WML '{name}' to DAG")
-            return f"Error: {e}", 400
-        except Exception as e:
-            logging.exception(f"Unknwon error while converting WML {name}")
-            return f"Internal error converting WML", 500
-
-        f_path = os.path.join(
-            app.config["project_conf"].dags_dir, f"{dag_handler.snake_name}.py"
-        )
-        with open(f_path, "w") as f:
-            f.write(py_content)
+    return "Created", 201
 
-        return "Created", 201
-    else:
-        return res
+
+@app.route("/v1/dags:batch", methods=["POST"])
+def post_dags_batch():
+    """Compiles many WMLs in one request, on the compile worker pool. Body is
+    {"wmls": [...]} where each item is either the name of a WML file in the
+    project's wml_dir, or a {"name": str, "wml": dict} object which is saved if
+    it compiles
+
+    Returns:
+        {"results": List[compile_wml result], "duration": float}
+    """
+    logging.info(f"POST /v1/dags:batch")
+
+    content = request.get_json(silent=True)
+    if not isinstance(content, dict) or not isinstance(content.get("wmls"), list):
+        return "Expected a JSON object with a list of wmls", 400
+
+    proj_conf = app.config["project_conf"]
+    wmls = []
+    for item in content["wmls"]:
+        if isinstance(item, dict) and isinstance(item.get("wml"), dict):
+            name, wml = item.get("name"), item["wml"]
+        else:
+            name, wml = item, None
+        if not isinstance(name, str) or not is_plain_filename(name):
+            return f"Invalid wml item {item!r}", 400
+        wmls.append((name, wml))
+
+    start = time.perf_counter()
+    results = compile_wmls(wmls, proj_conf.dags_dir, wml_dir=proj_conf.wml_dir)
+    for name, _ in wmls:
+        get_wml_cache().invalidate(os.path.join(proj_conf.wml_dir, name))
+    duration = round(time.perf_counter() - start, 4)
+
+    return jsonify({"results": results, "duration": duration}), 200
 
 
 #######################################################################
 # Build App
 #######################################################################
-def build_app(proj_conf: ProjectConfig, dev_server=False):
+def build_app(
+    proj_conf: ProjectConfig,
+    dev_server=False,
+    index_workers=ServerDefaults.INDEX_WORKERS,
+    render_cache_size=ServerDefaults.RENDER_CACHE_SIZE,
+    render_cache_disk_size=ServerDefaults.RENDER_CACHE_DISK_SIZE,
+    codegen_backend=ServerDefaults.CODEGEN_BACKEND,
+    validation_workers=ServerDefaults.VALIDATION_WORKERS,
+    validation_timeout=ServerDefaults.VALIDATION_TIMEOUT,
+    validation_memory_mb=ServerDefaults.VALIDATION_MEMORY_MB,
+    validation_max_jobs=ServerDefaults.VALIDATION_MAX_JOBS,
+    compile_workers=ServerDefaults.COMPILE_WORKERS,
+    wml_cache_size=ServerDefaults.WML_CACHE_SIZE,
+):
     app.config["project_conf"] = proj_conf
+    init_wml_index(proj_conf.wml_dir)
+    init_wml_cache(max_entries=wml_cache_size)
+    init_operator_index(
+        cache_file=proj_conf.operator_cache_file,
+        processes=index_workers,
+        custom_operators=proj_conf.operators_dir,
+    )
+    init_render_cache(
+        max_entries=render_cache_size,
+        cache_dir=proj_conf.render_cache_dir if render_cache_disk_size else None,
+        max_disk_entries=render_cache_disk_size,
+    )
+    DagHandler.set_codegen_backend(codegen_backend)
+    add_import_path(proj_conf.operators_dir)
+    init_validation_pool(
+        processes=validation_workers,
+        timeout=validation_timeout,
+        memory_limit_mb=validation_memory_mb or None,
+        max_jobs_per_worker=validation_max_jobs,
+    )
+    # Compile workers validate DAGs themselves, so get the same limits
+    init_compile_pool(
+        processes=compile_workers,
+        timeout=validation_timeout,
+        memory_limit_mb=validation_memory_mb or None,
+        max_jobs_per_worker=validation_max_jobs,
+    )
 
     if dev_server:
         logging.warning("Running a dev-build with CORS enabled")
@@ -0,0 +1,300 @@
+import io
+import re
+import tokenize
+from collections import namedtuple
+
+INDENT = " " * 4
+
+# A dict or list literal - items are (prefix, value) pairs, where the prefix is
+# the `key: ` of a dict item
+_Collection = namedtuple("_Collection", ["opening", "closing", "items"])
+
+# String prefixes that make Black treat a file as Python 3.6+
+_PY36_STRING_HEADS = {'f"', 'F"', "f'", "F'", "rf", "fr", "RF", "FR"}
+
+# Black's string normalisation patterns, for a single quoted string being
+# converted to a double quoted string
+_ESCAPED_NEW_QUOTE = re.compile(r'([^\\]|^)\\((?:\\\\)*)"')
+_ESCAPED_ORIG_QUOTE = re.compile(r"([^\\]|^)\\((?:\\\\)*)'")
+_UNESCAPED_NEW_QUOTE = re.compile(r'(([^\\]|^)(\\\\)*)"')
+
+
+def _sub_twice(regex, replacement, original):
+    """Regex matches can overlap, so the substitution is applied twice"""
+    return regex.sub(replacement, regex.sub(replacement, original))
+
+
+class CodeEmitter:
+    def __init__(self, line_length: int = 80):
+        """Emits DAG files that are already formatted the way the Jinja template
+        would be after a pass through Black, without running a formatter.
+
+        Calls are laid out like Black's right hand split - on one line if they
+        fit, otherwise with all arguments on one indented line, otherwise one
+        argument per line with a trailing comma. Dict and list values that don't
+        fit are split at their brackets, one item per line. String parameters
+        are quoted like Black's string normalisation and numbers are normalised
+        like Black's numeric literals. Raw code values and callable bodies are
+        emitted as written
+
+        Args:
+            line_length (int, optional): Max line length. Defaults to 80.
+        """
+        self.line_length = line_length
+
+    @staticmethod
+    def string_literals(value: str) -> list:
+        """Renders a string parameter the same way as
+        _ParamHandler.render_non_callable_for_jinja followed by Black. Single
+        quotes in the value end up as implicitly concatenated strings
+
+        Args:
+            value (str): Parameter value
+
+        Returns:
+            List[str]: String literals to be concatenated
+        """
+        return [CodeEmitter._quote(s) for s in value.split("'")]
+
+    @staticmethod
+    def _quote(body: str) -> str:
+        # Drop unnecessary escapes, then swap to double quotes if that doesn't
+        # add escapes
+        body = _sub_twice(_ESCAPED_NEW_QUOTE, r'\1\2"', body)
+        new_body = _sub_twice(_ESCAPED_ORIG_QUOTE, r"\1\2'", body)
+        new_body = _sub_twice(_UNESCAPED_NEW_QUOTE, r'\1\\"', new_body)
+
+        if new_body.count("\\") > body.count("\\"):
+            return f"'{body}'"
+        return f'"{new_body}"'
+
+    @staticmethod
+    def number_literal(value, allow_underscores: bool = False) -> str:
+        """Renders an int or float the same way as repr followed by Black's
+        numeric literal normalisation
+
+        Args:
+            value (Union[int, float]): Number
+            allow_underscores (bool, optional): Group long numbers with
+                underscores, as Black does for Python 3.6+ files. Defaults to False.
+
+        Returns:
+            str: Number literal
+        """
+
+        def digits(text, count_from_end=True):
+            if not allow_underscores or len(text) <= 5:
+                return text
+            if count_from_end:
+                return format(int("1" + text), "3_")[1:].lstrip("_")
+            return "_".join(text[i : i + 3] for i in range(0, len(text), 3))
+
+        def float_or_int(text):
+            if "." not in text:
+                return digits(text)
+            before, after = text.split(".")
+            return f"{digits(before)}.{digits(after, count_from_end=False)}"
+
+        text = repr(value)
+        sign = "-" if text.startswith("-") else ""
+        text = text.lstrip("-")
+        if "e" not in text:
+            return sign + float_or_int(text)
+
+        before, after = text.split("e")
+        exp_sign = "-" if after.startswith("-") else ""
+        return f"{sign}{float_or_int(before)}e{exp_sign}{digits(after.lstrip('+-'))}"
+
+    def literal(self, value, allow_underscores: bool = False):
+        """Renders a dict, list or scalar parameter value the same way as str
+        followed by Black
+
+        Args:
+            value (Any): Parameter value, as loaded from WML
+            allow_underscores (bool, optional): See CodeEmitter.number_literal
+
+        Returns:
+            Union[str, _Collection]: Literal, or a collection to be laid out by
+                                     CodeEmitter.lines
+        """
+        if isinstance(value, dict):
+            return _Collection(
+                "{",
+                "}",
+                [
+                    (
+                        f"{self.literal(k, allow_underscores)}: ",
+                        self.literal(v, allow_underscores),
+                    )
+                    for k, v in value.items()
+                ],
+            )
+        if isinstance(value, list):
+            return _Collection(
+                "[", "]", [("", self.literal(v, allow_underscores)) for v in value]
+            )
+        if isinstance(value, str):
+            quoted = repr(value)
+            # repr only picks double quotes when that avoids escapes, which
+            # Black keeps as they are
+            return quoted if quoted[0] == '"' else self._quote(quoted[1:-1])
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return self.number_literal(value, allow_underscores)
+        return str(value)
+
+    @staticmethod
+    def flat(value) -> str:
+        """Renders a value on a single line
+
+        Args:
+            value (Union[str, List[str], _Collection]): Literal, concatenated
+                string literals or a collection
+
+        Returns:
+            str: Python expression
+        """
+        if isinstance(value, _Collection):
+            items = ", ".join(k + CodeEmitter.flat(v) for k, v in value.items)
+            return f"{value.opening}{items}{value.closing}"
+        if isinstance(value, list):
+            return " ".join(value)
+        return value
+
+    def kwargs(self, handler, allow_underscores: bool = False) -> list:
+        """Renders the keyword arguments of a DagHandler or TaskHandler
+
+        Returns:
+            List[Tuple[str, Union[str, List[str], _Collection]]]: `key=` prefixes
+                and values, see CodeEmitter.flat
+        """
+        res = []
+        for k, v in handler.kwargs:
+            param = handler.params[k]
+            if param["type"] == "str":
+                v = self.string_literals(param["value"])
+            elif param["type"] != "callable" and not isinstance(param["value"], str):
+                v = self.literal(param["value"], allow_underscores)
+            res.append((f"{k}=", v))
+        return res
+
+    def lines(self, depth: int, prefix: str, value, suffix: str) -> list:
+        """Lays out `prefix value suffix` like Black's split_line. Lines that
+        don't fit are split at the brackets of a collection, with one item per
+        line if it has more than one. Concatenated strings are split with one
+        literal per line. Anything else is left as it is
+
+        Returns:
+            List[str]: Lines, without newlines
+        """
+        indent = INDENT * depth
+        line = f"{indent}{prefix}{self.flat(value)}{suffix}"
+        if len(line) <= self.line_length:
+            return [line]
+
+        if isinstance(value, list) and len(value) > 1:
+            return (
+                [f"{indent}{prefix}{value[0]}"]
+                + [f"{indent}{v}" for v in value[1:-1]]
+                + [f"{indent}{value[-1]}{suffix}"]
+            )
+        if isinstance(value, _Collection) and value.items:
+            return (
+                [f"{indent}{prefix}{value.opening}"]
+                + self.body_lines(depth + 1, value.items)
+                + [f"{indent}{value.closing}{suffix}"]
+            )
+        return [line]
+
+    def body_lines(self, depth: int, items: list) -> list:
+        """Lays out the items inside a pair of split brackets - a single item as
+        one (possibly split) line, several items one per line with trailing
+        commas
+        """
+        if len(items) == 1:
+            return self.lines(depth, *items[0], "")
+        return [line for k, v in items for line in self.lines(depth, k, v, ",")]
+
+    def assign_call(self, name: str, func: str, args: list) -> str:
+        """Renders `name = func(*args)`, split over lines as needed
+
+        Args:
+            name (str): Variable name
+            func (str): Callable name
+            args (List[Tuple[str, Any]]): Arguments, see CodeEmitter.kwargs
+
+        Returns:
+            str: Python statement
+        """
+        flat_args = [k + self.flat(v) for k, v in args]
+        line = f"{name} = {func}({', '.join(flat_args)})"
+        if len(line) <= self.line_length:
+            return line
+
+        # Unlike dict and list literals, call arguments stay on one line if they
+        # fit
+        body = INDENT + ", ".join(flat_args)
+        if len(body) > self.line_length:
+            body = "\n".join(self.body_lines(1, args))
+        return f"{name} = {func}(\n{body}\n)"
+
+    @staticmethod
+    def is_python36(code: str) -> bool:
+        """Whether Black would treat code as Python 3.6+, which changes how it
+        formats numbers. Only f-strings and underscores in numbers are checked
+
+        Args:
+            code (str): Python code
+
+        Returns:
+            bool: True if 3.6+ only features are used
+        """
+        try:
+            for tok in tokenize.generate_tokens(io.StringIO(code).readline):
+                if tok.type == tokenize.STRING and tok.string[:2] in _PY36_STRING_HEADS:
+                    return True
+                if tok.type == tokenize.NUMBER and "_" in tok.string:
+                    return True
+        except (tokenize.TokenError, IndentationError):
+            pass
+        return False
+
+    def emit(self, dag) -> str:
+        """Renders a DagHandler as Python code
+
+        Args:
+            dag (DagHandler): The DAG to render
+
+        Returns:
+            str: Formatted Python code
+        """
+        imports = ["import datetime", "from dateutil.tz import *", ""]
+        imports.append("from airflow.models.dag import DAG")
+        imports.extend(f"from {t.module} import {t.operator_type}" for t in dag.tasks)
+        sections = ["\n".join(imports)]
+
+        for func in list(dag.callables.values()) + [
+            func for task in dag.tasks for func in task.callables.values()
+        ]:
+            sections.append(
+                f"def {func['name']}(*args, **kwargs):\n{INDENT}{func['method']}"
+            )
+        py36 = self.is_python36("\n\n\n".join(sections))
+
+        sections.append(self.assign_call(dag.snake_name, "DAG", self.kwargs(dag, py36)))
+
+        tasks = [
+            self.assign_call(
+                task.snake_name,
+                task.operator_type,
+                self.kwargs(task, py36) + [("dag=", dag.snake_name)],
+            )
+            for task in dag.tasks
+        ]
+        if tasks:
+            sections.append("\n".join(tasks))
+
+        paths = dag.links.paths
+        if paths:
+            sections.append("\n".join(paths))
+
+        return "\n\n\n".join(sections) + "\n"
@@ -0,0 +1,181 @@
+import atexit
+import functools
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from marshmallow import EXCLUDE
+from marshmallow.exceptions import ValidationError
+
+from .dag_handler import DagHandler
+from ..schemas.app_schemas import MinimalWmlSchema
+from ..schemas.compiled_schema import compiled_schema
+from ...exceptions import DagHandlerValidationError, WorkerTimeoutError
+from ...utils.file_utils import is_plain_filename, resolve_in_dir, write_atomic
+from ...utils.render_cache import get_render_cache, init_render_cache
+from ...utils.worker_pool import WorkerPool
+
+
+def compile_wml(
+    name: str, wml: Optional[Dict], dags_dir: str, wml_dir: str = None
+) -> Dict:
+    """Converts a WML to a Python DAG in memory and, if that succeeds, writes
+    it to dags_dir. Files are written atomically and the DAG is only rewritten
+    if its contents changed, so Airflow doesn't re-parse unchanged DAGs
+
+    Args:
+        name (str): WML filename in wml_dir, used to read or save it and to
+            identify it in the result. Must not contain directories
+        wml (Optional[Dict]): WML dict, or None to read the WML file name from
+            wml_dir
+        dags_dir (str): Folder to write the DAG to
+        wml_dir (str, optional): Folder WML files are read from. If set and wml
+            is a dict, it is saved to this folder as name once it has compiled.
+            Defaults to None.
+
+    Returns:
+        Dict: name, status (as an HTTP status code), dag_file, dag_changed, error
+              and duration (in seconds)
+    """
+    start = time.perf_counter()
+    res = {
+        "name": name,
+        "status": 201,
+        "dag_file": None,
+        "dag_changed": False,
+        "error": None,
+    }
+
+    wml_path = None
+    if wml is None and wml_dir and is_plain_filename(name):
+        # Resolved so that symlinks can't point outside of wml_dir either
+        wml_path = resolve_in_dir(wml_dir, name)
+    if not is_plain_filename(name) or (wml is None and not wml_path):
+        res.update(status=400, error=f"Invalid WML name {name!r}")
+        res["duration"] = round(time.perf_counter() - start, 4)
+        return res
+
+    save_wml = wml_dir and wml is not None
+    try:
+        if wml_path:
+            with open(wml_path, "r") as f:
+                wml = json.load(f)
+        if not isinstance(wml, dict):
+            raise ValueError("WML must be a JSON object")
+        wml_dict_parsed = compiled_schema(MinimalWmlSchema).load(wml, unknown=EXCLUDE)
+    except OSError:
+        res.update(status=404, error=f"File {name} not found")
+    except (ValueError, ValidationError):
+        logging.exception("Error parsing WML")
+        res.update(status=400, error="Unable to deserialise WML contents")
+    else:
+        try:
+            dag_handler = DagHandler.load_from_wml(wml_dict_parsed)
+            py_content = dag_handler.to_python()
+            dag_file = f"{dag_handler.snake_name}.py"
+
+            if save_wml:
+                write_atomic(os.path.join(wml_dir, name), json.dumps(wml))
+            res["dag_changed"] = write_atomic(
+                os.path.join(dags_dir, dag_file), py_content, skip_unchanged=True
+            )
+            res["dag_file"] = dag_file
+        except DagHandlerValidationError as e:
+            logging.exception(f"Unable to convert WML '{name}' to DAG")
+            res.update(status=400, error=f"Error: {e}")
+        except Exception as e:
+            logging.exception(f"Unknwon error while converting WML {name}")
+            res.update(status=500, error="Internal error converting WML")
+
+    res["duration"] = round(time.perf_counter() - start, 4)
+    return res
+
+
+def compile_wmls(
+    wmls: List[Tuple[str, Optional[Dict]]], dags_dir: str, wml_dir: str = None
+) -> List[Dict]:
+    """Compiles many WMLs, on the compile pool if one is configured, otherwise
+    in this process
+
+    Args:
+        wmls (List[Tuple[str, Optional[Dict]]]): (name, wml) pairs - see compile_wml
+        dags_dir (str): Folder to write DAGs to
+        wml_dir (str, optional): Folder to read and save WMLs - see compile_wml
+
+    Returns:
+        List[Dict]: compile_wml result for each WML, in order
+    """
+    pool = _compile_pool
+    if not pool or len(wmls) < 2:
+        return [compile_wml(name, wml, dags_dir, wml_dir) for name, wml in wmls]
+
+    def run(name, wml):
+        start = time.perf_counter()
+        try:
+            return pool.run(compile_wml, name, wml, dags_dir, wml_dir)
+        except WorkerTimeoutError as e:  # Most likely the DAG hangs on import
+            status, error = 400, f"Error: {e}"
+        except Exception as e:  # The worker died
+            logging.exception(f"Unable to compile WML {name} on a worker")
+            status, error = 500, f"{type(e).__name__}: {e}"
+        return {
+            "name": name,
+            "status": status,
+            "dag_file": None,
+            "dag_changed": False,
+            "error": error,
+            "duration": round(time.perf_counter() - start, 4),
+        }
+
+    with ThreadPoolExecutor(max_workers=pool.processes) as executor:
+        return list(executor.map(lambda item: run(*item), wmls))
+
+
+def _init_compile_worker(codegen_backend, cache_dir, max_disk_entries):
+    """Initializer for compile pool workers"""
+    DagHandler.set_codegen_backend(codegen_backend)
+    init_render_cache(cache_dir=cache_dir, max_disk_entries=max_disk_entries)
+
+
+_compile_pool: WorkerPool = None
+
+
+def get_compile_pool() -> WorkerPool:
+    return _compile_pool
+
+
+def init_compile_pool(processes: int = 0, **kwargs) -> WorkerPool:
+    """Replaces the global compile pool used by compile_wmls. Workers use the
+    code generation backend and render cache directory that this process has
+    when the pool is created, and validate DAGs themselves - so the pool's
+    timeout and memory limit apply to each WML. WMLs are compiled in-process if
+    processes is 0
+
+    Args:
+        processes (int, optional): Number of worker processes. Defaults to 0.
+        kwargs: See WorkerPool
+
+    Returns:
+        WorkerPool: The global compile pool, or None
+    """
+    global _compile_pool
+
+    if _compile_pool:
+        _compile_pool.close()
+    _compile_pool = None
+    if processes:
+        render_cache = get_render_cache()
+        initializer = functools.partial(
+            _init_compile_worker,
+            DagHandler.codegen_backend,
+            render_cache.cache_dir,
+            render_cache.max_disk_entries,
+        )
+        _compile_pool = WorkerPool(processes, initializer=initializer, **kwargs)
+    return _compile_pool
+
+
+atexit.register(init_compile_pool)
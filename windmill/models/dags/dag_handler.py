@@ -1,40 +1,65 @@
 import datetime
+import hashlib
 import json
 import logging
 import re
 import uuid
 from abc import ABC, abstractproperty
-from copy import deepcopy
 from os.path import basename, splitext
 from typing import List, Dict, Union
 
 import black
 from airflow.models.dag import DAG
 from airflow.operators import BaseOperator
+from airflow.version import version as airflow_version
 from dateutil import parser
 from inflection import underscore
 from jinja2 import Environment, PackageLoader, select_autoescape
 from marshmallow import fields, Schema
-from networkx import (
-    DiGraph,
-    is_directed_acyclic_graph,
-    dag_longest_path,
-    topological_sort,
-    edge_bfs,
-)
+from networkx import DiGraph, is_directed_acyclic_graph, topological_sort
 
+from .code_emitter import CodeEmitter
+from .parameter import Parameter
 from ..operators.operator_index import get_operator_index
 from ..schemas.app_schemas import DagSchema, OperatorParameterSchema, MinimalWmlSchema
+from ..schemas.compiled_schema import compiled_schema
 from ...config.project_config import ProjectConfig
-from ...constants import GraphConstants
+from ...constants import GraphConstants, ServerDefaults
 from ...exceptions import DagHandlerValidationError
-from ...utils.class_parser import ClassParser
-from ...utils.import_handler import import_str_as_module, import_dag_from_project
+from ...utils.class_parser import ClassParser, copy_class_props
+from ...utils.encoded_payload import EncodedPayload
+from ...utils.import_handler import import_dag_from_project
+from ...utils.render_cache import get_render_cache
+from ...utils.validation_pool import validate_py_code
+from ... import __version__ as windmill_version
 
 _op_schema = OperatorParameterSchema()
+_non_identifier_chars = re.compile("[^0-9a-zA-Z_]")
+_leading_non_identifier = re.compile("^[^a-zA-Z_]+")
+
+CODEGEN_BACKENDS = ("jinja", "emitter")
+
+
+def check_codegen_backend(backend: str) -> str:
+    """Validates a code generation backend name
+
+    Args:
+        backend (str): Backend name
+
+    Raises:
+        ValueError: If backend isn't one of CODEGEN_BACKENDS
+
+    Returns:
+        str: backend
+    """
+    if backend not in CODEGEN_BACKENDS:
+        raise ValueError(f"Unknown code generation backend '{backend}'")
+    return backend
 
 
 class _ParamHandler(ABC):
+    __slots__ = ()
+
     def __init__(self, params):
         """Helper class to deal with parameter rendering
         """
@@ -55,16 +80,16 @@ class _ParamHandler(ABC):
             DagHandlerValidationError: If a required parameter doesn't have a value
         
         Returns:
-            [dict]: Mapping between non-default fields and values
+            [dict]: Mapping between non-default fields and Parameters
         """
-        params = [_op_schema.load(param) for param in params]
+        params = compiled_schema(OperatorParameterSchema).load_many(params)
         for param in params:
             if param.get("required", False) and param.get("value") == None:
                 raise DagHandlerValidationError(
                     f"'{param['id']}' is a required parameter'"
                 )
         return {
-            param["id"]: param
+            param["id"]: Parameter.from_dict(param)
             for param in params
             if param.get("value") and param["value"] != param.get("default")
         }
@@ -127,22 +152,30 @@ class _ParamHandler(ABC):
         }
 
     @property
-    def params_to_kwargs(self):
-        """Converts task parameters into a valid kwargs expression
+    def kwargs(self):
+        """List of (parameter name, rendered value) pairs, with callables last
+
+        Returns:
+            List[Tuple[str, str]]: Keyword arguments
         """
+        callables = self.callables
         non_callables = [
-            f"{k} = {self.render_non_callable_for_jinja(v)}"
+            (k, self.render_non_callable_for_jinja(v))
             for k, v in self.params.items()
-            if k not in self.callables
+            if k not in callables
         ]
-        params = ", ".join(
-            non_callables
-            + [f"{k} = {self.param_to_callable(k)}" for k in self.callables]
-        )
-        return params
+        return non_callables + [(k, v["name"]) for k, v in callables.items()]
+
+    @property
+    def params_to_kwargs(self):
+        """Converts task parameters into a valid kwargs expression
+        """
+        return ", ".join(f"{k} = {v}" for k, v in self.kwargs)
 
 
 class TaskHandler(_ParamHandler):
+    __slots__ = ("node_id", "operator_type", "module", "params", "_snake_name")
+
     def __init__(self, node_id, operator_type, module, task_params):
         """Schema for a Task Instance, that can be loaded from an App Node object
         
@@ -150,7 +183,7 @@ class TaskHandler(_ParamHandler):
             node_id (str): Internal Node ID used by LinkInstances
             operator_type (str): Name of the operator class
             module (str): Module path to import operator
-            task_params (dict): List of Task Parameters
+            task_params (dict): Mapping of parameter ids to Parameters
         """
         self.node_id = node_id
         self.operator_type = operator_type
@@ -166,17 +199,15 @@ class TaskHandler(_ParamHandler):
     @property
     def snake_name(self):
         """snakecase version of task_params["task_id"]. Python 
-        variable names can't start with a number
+        variable names can't start with a number. Computed on first access
         
         Returns:
             [str]: task_name
         """
-        if not self._snake_name:
+        if self._snake_name is None:
             name = underscore(self.task_id)
-            name = re.sub("[^0-9a-zA-Z_]", "", name)
-            name = re.sub("^[^a-zA-Z_]+", "", name)
-
-            return name
+            name = _non_identifier_chars.sub("", name)
+            self._snake_name = _leading_non_identifier.sub("", name)
         return self._snake_name
 
     @snake_name.setter
@@ -236,26 +267,25 @@ class TaskHandler(_ParamHandler):
         Returns:
             Dict -- JSON dict matching NodeSchema
         """
-        op_index = get_operator_index()
-        for operator in op_index.marshalled_operators:
-            # FIXME Validate module?
-            if operator["type"] == self.operator_type:
-                properties_dict = deepcopy(operator["properties"])
-                for parameter in properties_dict["parameters"]:
-                    field = parameter["id"]
-                    if field in self.params:
-                        parameter["value"] = self.params[field]["value"]
-                properties_dict["name"] = self.params["task_id"]["value"]
-                return {
-                    "id": self.node_id,
-                    "position": {"x": x, "y": y},
-                    "properties": properties_dict,
-                    "type": self.operator_type,
-                }
+        # FIXME Validate module?
+        operator = get_operator_index().get_marshalled_operator(self.operator_type)
+        if not operator:
+            raise DagHandlerValidationError(
+                f"Unable to find operator class task {self.operator_type}"
+            )
 
-        raise DagHandlerValidationError(
-            f"Unable to find operator class task {self.operator_type}"
-        )
+        properties_dict = operator["properties"]
+        for parameter in properties_dict["parameters"]:
+            field = parameter["id"]
+            if field in self.params:
+                parameter["value"] = self.params[field]["value"]
+        properties_dict["name"] = self.params["task_id"]["value"]
+        return {
+            "id": self.node_id,
+            "position": {"x": x, "y": y},
+            "properties": properties_dict,
+            "type": self.operator_type,
+        }
 
 
 class Links:
@@ -327,16 +357,29 @@ class Links:
         [1, 2, 4, 5, 6]
         [1, 3, 7]
         [3, 6]
+
+        Paths are walked from each node in topological order along unused edges,
+        following the successor with the longest downstream path (the most
+        recently added edge breaks ties). Each node starts one path per
+        outgoing edge in excess of its incoming edges, which is the minimum
+        number of paths that covers every edge
         """
-        G = deepcopy(graph)
-        paths = []
-        while len(G.edges()) > 0:
-            longest_path = dag_longest_path(G)
-            paths.append(longest_path)
-            edges = list(zip(longest_path[:-1], longest_path[1:]))
+        order = list(topological_sort(graph))
+
+        depth = {}
+        for node in reversed(order):
+            depth[node] = max((depth[n] + 1 for n in graph.succ[node]), default=0)
 
-            for edge in edges:
-                G.remove_edge(*edge)
+        # Ascending by depth so that pop() returns the deepest successor
+        unused = {node: sorted(graph.succ[node], key=depth.get) for node in order}
+
+        paths = []
+        for node in order:
+            while unused[node]:
+                path = [node]
+                while unused[path[-1]]:
+                    path.append(unused[path[-1]].pop())
+                paths.append(path)
         return paths
 
     def get_bitshift_paths(self):
@@ -360,15 +403,15 @@ class Links:
         2   3   4
           5   6
             7
+
+        Levels are assigned by longest-path layering in a single topological
+        pass - a node sits one level below its deepest upstream node
         """
         levels = []
+        node_levels = {}
         for node in topological_sort(g):
-            upstream_nodes = list(edge_bfs(g, node, orientation="reverse"))
-            ind = 0
-            for up_node, _, _ in upstream_nodes:
-                for level_index, level in enumerate(levels):
-                    if up_node in level:
-                        ind = max(ind, level_index + 1)
+            ind = max((node_levels[up_node] + 1 for up_node in g.pred[node]), default=0)
+            node_levels[node] = ind
             if len(levels) < ind + 1:
                 levels.append([node])
             else:
@@ -412,6 +455,10 @@ class DagHandler(_ParamHandler):
         loader=PackageLoader("windmill", "templates"),
         autoescape=select_autoescape(enabled_extensions=["j2"]),
     )
+    emitter = CodeEmitter(line_length=80)
+    codegen_backend = ServerDefaults.CODEGEN_BACKEND
+    _dag_docstring = None
+    _encoded_dag_docstring = None
 
     def __init__(
         self, dag_params: dict, tasks: List[TaskHandler], links: Links, filename: str
@@ -464,24 +511,45 @@ class DagHandler(_ParamHandler):
         if len(task_ids) != len(set(task_ids)):
             raise DagHandlerValidationError("DAGs cannot have duplicate task IDs")
 
-        snake_names = []
+        # Suffixes are only ever taken, so each base name's search resumes from
+        # the last suffix tried rather than from 0
+        snake_names = set()
+        next_suffix = {}
         for task in tasks:
-            if task.snake_name in snake_names:
-                basename = task.snake_name
-                ind = 0
+            name = task.snake_name
+            if name in snake_names:
+                basename = name
+                ind = next_suffix.get(basename, 0)
                 name = f"{basename}_{ind}"
                 while name in snake_names:
                     ind += 1
                     name = f"{basename}_{ind}"
-                snake_names.append(name)
+                next_suffix[basename] = ind + 1
                 task.snake_name = name
-            else:
-                snake_names.append(task.task_id)
+            snake_names.add(name)
         return tasks
 
     @classmethod
     def marshall_dag_docstring(cls):
-        return DagSchema().dump(cls.docstring_parser.parse_class(DAG)[1])
+        """DAG class properties, matching DagSchema. The DAG class can't change
+        without a restart so it's only parsed and dumped once - callers get a copy
+        """
+        if DagHandler._dag_docstring is None:
+            DagHandler._dag_docstring = DagSchema().dump(
+                cls.docstring_parser.parse_class(DAG)[1]
+            )
+        return copy_class_props(DagHandler._dag_docstring)
+
+    @classmethod
+    def encoded_dag_docstring(cls) -> EncodedPayload:
+        """marshall_dag_docstring encoded as JSON, with compressed variants. The
+        DAG class can't change without a restart so this is only built once
+        """
+        if DagHandler._encoded_dag_docstring is None:
+            DagHandler._encoded_dag_docstring = EncodedPayload.from_json(
+                cls.marshall_dag_docstring()
+            )
+        return DagHandler._encoded_dag_docstring
 
     @classmethod
     def load_from_wml(cls, wml_dict):
@@ -562,26 +630,85 @@ class DagHandler(_ParamHandler):
 
         return DagHandler(dag_params, tasks, links, splitext(basename(dag.fileloc))[0])
 
-    def to_python(self):
+    @classmethod
+    def set_codegen_backend(cls, backend: str):
+        """Sets the default code generation backend used by to_python
+
+        Args:
+            backend (str): One of CODEGEN_BACKENDS
+
+        Raises:
+            ValueError: If the backend is unknown
+        """
+        cls.codegen_backend = check_codegen_backend(backend)
+
+    def to_python(self, backend: str = None):
         """Renders the Dag Instance as Python Code:
-        - Python generated using Jinja template
-        - Formatted using Black
+        - Python generated using the Jinja template and formatted using Black, or
+          emitted pre-formatted by CodeEmitter
         - Import from str to validate generated py code
+        - Cached by render_key, so unchanged DAGs skip the steps above
+
+        Args:
+            backend (str, optional): One of CODEGEN_BACKENDS. Defaults to
+                DagHandler.codegen_backend
 
         Returns:
             [str]: The formatted DAG 
         """
-        template = self.env.get_template("dag.j2")
-        res = template.render(dag=self)
-        py_code = black.format_str(res, line_length=80)
+        backend = check_codegen_backend(backend or self.codegen_backend)
+
+        render_cache = get_render_cache()
+        key = f"{backend}-{self.render_key()}"
+        py_code = render_cache.get(key)
+        if py_code is not None:
+            return py_code
+
+        if backend == "emitter":
+            py_code = self.emitter.emit(self)
+        else:
+            template = self.env.get_template("dag.j2")
+            res = template.render(dag=self)
+            py_code = black.format_str(res, line_length=80)
 
         try:
-            import_str_as_module(py_code, "wml_dag")
+            validate_py_code(py_code, "wml_dag")
         except Exception as e:
             raise DagHandlerValidationError(f"Rendered dag is invalid: {str(e)}") from e
 
+        render_cache.put(key, py_code)
         return py_code
 
+    def render_key(self) -> str:
+        """Canonical hash of everything that affects the rendered Python - DAG and
+        task parameters, operator modules and links, and the Windmill and Airflow
+        versions that rendered and validated it. Node positions, link IDs and
+        other UI-only fields are excluded
+
+        Returns:
+            [str]: sha256 hex digest
+        """
+
+        def params_key(params):
+            return {k: [v["type"], v["value"]] for k, v in params.items()}
+
+        content = {
+            "windmill": windmill_version,
+            "airflow": airflow_version,
+            "dag": params_key(self.params),
+            "tasks": [
+                [t.snake_name, t.operator_type, t.module, params_key(t.params)]
+                for t in self.tasks
+            ],
+            "links": [
+                [self.links.task_name_mappings.get(n, n) for n in edge]
+                for edge in self.links.graph.edges
+            ],
+        }
+        return hashlib.sha256(
+            json.dumps(content, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
 
 class DagFileHandler:
     def __init__(self, pyfile: str, config: ProjectConfig):
@@ -0,0 +1,104 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from .dag_handler import DagFileHandler, DagHandler
+from ..operators.operator_index import init_operator_index
+from ...config.project_config import ProjectConfig
+from ...exceptions import WorkerTimeoutError
+from ...utils.file_utils import write_atomic
+from ...utils.worker_pool import WorkerPool
+
+
+def import_dag_file(pyfile: str, config: ProjectConfig) -> List[str]:
+    """Imports a Python file from the project's dags folder and writes each DAG
+    in it to the WML folder. WMLs are named after the file, suffixed with the DAG
+    name if the file defines several DAGs
+
+    Args:
+        pyfile (str): Filename in the dags folder
+        config (ProjectConfig): Project config
+
+    Returns:
+        List[str]: Filenames of the WMLs written
+    """
+    init_operator_index(
+        cache_file=config.operator_cache_file, custom_operators=config.operators_dir
+    )
+    dags = DagFileHandler(pyfile, config).dags
+    handlers = [DagHandler.load_from_dag(dag) for dag in dags.values()]
+
+    stem = os.path.splitext(pyfile)[0]
+    wml_files = []
+    for handler in handlers:
+        if len(handlers) > 1:
+            handler.filename = f"{stem}_{handler.snake_name}"
+        wml_file = f"{handler.filename}.wml"
+        write_atomic(
+            os.path.join(config.wml_dir, wml_file),
+            json.dumps(handler.to_wml()),
+            skip_unchanged=True,
+        )
+        wml_files.append(wml_file)
+    return wml_files
+
+
+def import_dag_files(
+    pyfiles: List[str],
+    config: ProjectConfig,
+    processes: int = 1,
+    timeout: float = 60,
+    memory_limit_mb: int = None,
+) -> List[Dict]:
+    """Converts existing Python DAG files to WMLs - see import_dag_file. Each file
+    is imported on an isolated worker process, so a file that hangs, crashes or
+    leaks only fails itself
+
+    Args:
+        pyfiles (List[str]): Filenames in the dags folder
+        config (ProjectConfig): Project config
+        processes (int, optional): Number of worker processes. Defaults to 1.
+        timeout (float, optional): Per-file timeout in seconds. Defaults to 60.
+        memory_limit_mb (int, optional): Address space limit for each worker.
+            Defaults to None (unlimited).
+
+    Returns:
+        List[Dict]: name, wml_files, error and duration (in seconds) for each
+                    file, in order
+    """
+    if not pyfiles:
+        return []
+
+    pool = WorkerPool(
+        processes=max(min(processes, len(pyfiles)), 1),
+        timeout=timeout,
+        memory_limit_mb=memory_limit_mb,
+        initializer=_init_import_worker,
+    )
+
+    def run(pyfile):
+        start = time.perf_counter()
+        res = {"name": pyfile, "wml_files": [], "error": None}
+        try:
+            res["wml_files"] = pool.run(import_dag_file, pyfile, config)
+        except WorkerTimeoutError:
+            res["error"] = f"Timed out after {timeout}s"
+        except Exception as e:
+            res["error"] = f"{type(e).__name__}: {e}"
+        res["duration"] = round(time.perf_counter() - start, 4)
+        return res
+
+    try:
+        with ThreadPoolExecutor(max_workers=pool.processes) as executor:
+            return list(executor.map(run, pyfiles))
+    finally:
+        pool.close()
+
+
+def _init_import_worker():
+    """Initializer for import_dag_files workers"""
+    from ...utils.import_handler import import_airflow
+
+    import_airflow()
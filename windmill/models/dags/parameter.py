@@ -0,0 +1,92 @@
+import weakref
+from collections.abc import MutableMapping
+from typing import Dict
+
+# Fields of OperatorParameterSchema other than value
+SPEC_FIELDS = ("id", "type", "default", "description", "required", "inheritedFrom")
+
+_UNSET = object()
+
+
+class ParameterSpec:
+    __slots__ = SPEC_FIELDS + ("__weakref__",)
+
+    def __init__(self, *values):
+        """Description of an operator parameter, shared by every task that sets
+        the parameter so must not be modified. Fields that weren't given are _UNSET
+        """
+        for field, value in zip(SPEC_FIELDS, values):
+            setattr(self, field, value)
+
+
+_specs = weakref.WeakValueDictionary()
+
+
+def intern_spec(param: Dict) -> ParameterSpec:
+    """Returns the shared ParameterSpec for the non-value fields of param"""
+    key = tuple(param.get(field, _UNSET) for field in SPEC_FIELDS)
+    spec = _specs.get(key)
+    if spec is None:
+        spec = _specs[key] = ParameterSpec(*key)
+    return spec
+
+
+class Parameter(MutableMapping):
+    __slots__ = ("spec", "value")
+
+    def __init__(self, spec: ParameterSpec, value=None):
+        """A parameter value of a task or DAG. Behaves like the dict loaded with
+        OperatorParameterSchema, but only stores the value - id, type, docs and
+        defaults live in a ParameterSpec shared between tasks
+
+        Args:
+            spec (ParameterSpec): See intern_spec
+            value (optional): Parameter value. Defaults to None.
+        """
+        self.spec = spec
+        self.value = value
+
+    @classmethod
+    def from_dict(cls, param: Dict) -> "Parameter":
+        """Creates a Parameter from a dict matching OperatorParameterSchema"""
+        return cls(intern_spec(param), param.get("value"))
+
+    def __getitem__(self, key):
+        if key == "value":
+            return self.value
+        if key in SPEC_FIELDS:
+            value = getattr(self.spec, key)
+            if value is not _UNSET:
+                return value
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key == "value":
+            self.value = value
+        else:
+            self.spec = intern_spec({**self, key: value})
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        if key == "value":
+            self.value = None
+        else:
+            param = dict(self)
+            del param[key]
+            self.spec = intern_spec(param)
+
+    def __iter__(self):
+        for field in SPEC_FIELDS:
+            if getattr(self.spec, field) is not _UNSET:
+                yield field
+        yield "value"
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __reduce__(self):
+        return (Parameter.from_dict, (dict(self),))
+
+    def __repr__(self):
+        return f"Parameter({dict(self)})"
@@ -0,0 +1,119 @@
+import hashlib
+import importlib.util
+import inspect
+import logging
+import os
+import threading
+from typing import Dict, List
+
+from airflow import operators
+
+from .operator_handler import OperatorHandler
+from ...exceptions import OperatorMarshallError
+
+
+class CustomOperatorIndex:
+    def __init__(self, operators_dir: str):
+        """Incremental index of the operators defined in a project's custom
+        operators folder. Each refresh only stats the folder - files are
+        re-imported and re-marshalled if their mtime or size changed and their
+        content hash differs from the last import
+
+        Args:
+            operators_dir (str): Folder of Python files defining operators
+        """
+        self.operators_dir = operators_dir
+        self._files = {}
+        self._lock = threading.Lock()
+
+    @property
+    def marshalled_operators(self) -> List[Dict]:
+        """Marshalled operators from every indexed file, sorted by file"""
+        return [op for f in sorted(self._files) for op in self._files[f]["operators"]]
+
+    def refresh(self, blocking: bool = True) -> bool:
+        """Re-indexes files that were added, changed or removed since the last
+        refresh
+
+        Args:
+            blocking (bool, optional): If False and another thread is refreshing,
+                return straight away. Defaults to True.
+
+        Returns:
+            bool: True if the marshalled operators changed
+        """
+        if not self._lock.acquire(blocking):
+            return False
+        try:
+            return self._refresh()
+        finally:
+            self._lock.release()
+
+    def _refresh(self) -> bool:
+        try:
+            with os.scandir(self.operators_dir) as it:
+                entries = {
+                    e.name: e for e in it if e.name.endswith(".py") and e.is_file()
+                }
+        except FileNotFoundError:
+            entries = {}
+
+        changed = False
+        for name in self._files.keys() - entries.keys():
+            if self._files.pop(name)["operators"]:
+                changed = True
+
+        for name, entry in entries.items():
+            stat = entry.stat()
+            current = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+            old = self._files.get(name)
+            if old and all(old[k] == v for k, v in current.items()):
+                continue
+
+            with open(entry.path, "rb") as f:
+                current["hash"] = hashlib.sha256(f.read()).hexdigest()
+            if old and old["hash"] == current["hash"]:
+                self._files[name] = {**old, **current}
+                continue
+
+            logging.info(f"Indexing custom operators in {name}")
+            current["operators"] = self.marshall_file(entry.path)
+            self._files[name] = current
+            if (old["operators"] if old else []) != current["operators"]:
+                changed = True
+        return changed
+
+    @staticmethod
+    def marshall_file(path: str) -> List[Dict]:
+        """Imports a Python file and marshalls the operators defined in it. The
+        module is named after the file, as Airflow imports it from its plugins
+        or DAGs folder
+
+        Args:
+            path (str): Python file
+
+        Returns:
+            List[Dict]: Marshalled operators, sorted by name. Empty if the file
+                can't be imported
+        """
+        modname = os.path.splitext(os.path.basename(path))[0]
+        try:
+            spec = importlib.util.spec_from_file_location(modname, path)
+            mod = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(mod)
+        except Exception as e:
+            logging.exception(f"Unable to import custom operators from {path}: {e}")
+            return []
+
+        marshalled = []
+        for _, operator in sorted(vars(mod).items()):
+            if (
+                inspect.isclass(operator)
+                and issubclass(operator, operators.BaseOperator)
+                and operator.__module__ == modname
+            ):
+                try:
+                    marshalled.append(OperatorHandler.from_operator(operator).dump())
+                except OperatorMarshallError as e:
+                    logging.exception(f"Unable to parse operator {operator}: {e}")
+        return marshalled
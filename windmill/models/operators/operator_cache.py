@@ -0,0 +1,91 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+from airflow import operators
+from airflow.version import version as airflow_version
+
+from ... import __version__ as windmill_version
+
+
+class OperatorCache:
+    def __init__(self, cache_file: str):
+        """On-disk cache of the marshalled operator catalogue. Entries are keyed
+        by the Airflow version, the Windmill version and the mtime/size of every
+        module under `airflow.operators`, so that a change to any of them
+        invalidates the cache
+
+        Args:
+            cache_file (str): Path to the JSON cache file
+        """
+        self.cache_file = cache_file
+
+    @staticmethod
+    def fingerprint() -> dict:
+        """Describe the inputs of the operator catalogue without importing any
+        operator modules
+
+        Returns:
+            dict: Versions and {module_file: [mtime_ns, size]} of scanned modules
+        """
+        modules = {}
+        for path in operators.__path__:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.name.endswith(".py") or entry.is_dir():
+                        stat = entry.stat()
+                        modules[entry.name] = [stat.st_mtime_ns, stat.st_size]
+
+        return {
+            "airflow": airflow_version,
+            "windmill": windmill_version,
+            "modules": dict(sorted(modules.items())),
+        }
+
+    @classmethod
+    def cache_key(cls, fingerprint: dict = None) -> str:
+        """sha256 digest of a fingerprint, defaults to the current fingerprint"""
+        fingerprint = fingerprint or cls.fingerprint()
+        return hashlib.sha256(
+            json.dumps(fingerprint, sort_keys=True).encode()
+        ).hexdigest()
+
+    def load(self, key: str):
+        """Returns the cached operators if the cache file matches key
+
+        Args:
+            key (str): Expected cache key, see OperatorCache.cache_key
+
+        Returns:
+            List[Dict]: Marshalled operators, or None on a cache miss
+        """
+        try:
+            with open(self.cache_file, "r") as f:
+                contents = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.info(f"Operator cache {self.cache_file} unavailable: {e}")
+            return None
+
+        if contents.get("key") != key:
+            logging.info(f"Operator cache {self.cache_file} is stale")
+            return None
+        return contents["operators"]
+
+    def save(self, key: str, marshalled_operators: list):
+        """Atomically writes marshalled operators to the cache file
+
+        Args:
+            key (str): Cache key, see OperatorCache.cache_key
+            marshalled_operators (list): Result of OperatorIndex.marshall_operator_list
+        """
+        cache_dir = os.path.dirname(os.path.abspath(self.cache_file))
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump({"key": key, "operators": marshalled_operators}, f)
+            os.replace(tmp_path, self.cache_file)
+        except OSError as e:
+            logging.warning(f"Unable to write operator cache {self.cache_file}: {e}")
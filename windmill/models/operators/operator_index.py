@@ -1,39 +1,171 @@
 import inspect
 import logging
 import pkgutil
+import time
+from concurrent.futures import ProcessPoolExecutor
 from importlib import import_module
 
 from airflow import operators
 
+from .custom_operators import CustomOperatorIndex
+from .operator_cache import OperatorCache
 from .operator_handler import OperatorHandler
+from ...constants import ServerDefaults
 from ...exceptions import OperatorMarshallError
+from ...utils.encoded_payload import EncodedPayload
 
 
-__all__ = ["get_operator_index"]
+__all__ = ["get_operator_index", "init_operator_index"]
 
 
 class OperatorIndex:
-    def __init__(self, custom_operators=""):
+    def __init__(
+        self,
+        custom_operators="",
+        cache_file=None,
+        processes=0,
+        custom_refresh_interval=ServerDefaults.CUSTOM_OPERATORS_REFRESH_MS / 1000,
+    ):
         """Stateful object to index built-in and custom airflow
         operators
 
         Args:
             custom_operators (str, optional): Path to directory containing 
-                custom operators. Defaults to "".
+                custom operators, which are indexed after the Airflow operators.
+                Defaults to "".
+            cache_file (str, optional): Path to the on-disk operator cache. If
+                not provided the catalogue is always rebuilt. Defaults to None.
+            processes (int, optional): If set, the catalogue is built on a pool of
+                this many worker processes. Defaults to 0 (serial).
+            custom_refresh_interval (float, optional): Min seconds between scans
+                of the custom operators folder. Defaults to 1.
         """
 
         self.custom_operators = custom_operators
-        self.operator_list = self.get_operators()
+        self.custom = None
+        if custom_operators:
+            self.custom = CustomOperatorIndex(custom_operators)
+        self.cache = OperatorCache(cache_file) if cache_file else None
+        self.processes = processes
+        self.custom_refresh_interval = custom_refresh_interval
+        self._custom_refreshed_at = None
+        self._operator_list = None
+        self._builtin_operators = None
         self._marshalled_operators = None
+        self._operators_by_type = None
+        self._encoded_operators = None
+        self._operators_by_class = {}
+
+    @property
+    def operator_list(self):
+        if self._operator_list is None:
+            self._operator_list = self.get_operators()
+        return self._operator_list
 
     @property
     def marshalled_operators(self):
-        if not self._marshalled_operators:
-            self._marshalled_operators = self.marshall_operator_list()
+        if self._builtin_operators is None:
+            self._builtin_operators = self.load_marshalled_operators()
+            if self.custom:
+                self.custom.refresh()
+                self._custom_refreshed_at = time.monotonic()
+            self._marshalled_operators = None
+        if self._marshalled_operators is None:
+            custom = self.custom.marshalled_operators if self.custom else []
+            self._marshalled_operators = self._builtin_operators + custom
+            self._operators_by_type = None
+            self._encoded_operators = None
         return self._marshalled_operators
 
+    def refresh_custom_operators(self) -> bool:
+        """Re-indexes custom operator files that changed since they were last
+        indexed - see CustomOperatorIndex. If any operators changed the catalogue,
+        and so its ETag, is rebuilt on next access. Called on every request, so
+        the folder is scanned at most once per custom_refresh_interval and callers
+        never wait for another thread's scan
+
+        Returns:
+            bool: True if the catalogue changed
+        """
+        if self._builtin_operators is None or not self.custom:
+            return False
+        now = time.monotonic()
+        if now - self._custom_refreshed_at < self.custom_refresh_interval:
+            return False
+        self._custom_refreshed_at = now
+        if not self.custom.refresh(blocking=False):
+            return False
+        self._marshalled_operators = None
+        return True
+
+    @property
+    def encoded_operators(self) -> EncodedPayload:
+        """marshalled_operators encoded as JSON, with compressed variants"""
+        marshalled_operators = self.marshalled_operators
+        if self._encoded_operators is None:
+            self._encoded_operators = EncodedPayload.from_json(marshalled_operators)
+        return self._encoded_operators
+
+    @property
+    def operators_by_type(self):
+        """Lookup table of marshalled operators keyed by operator type. If types
+        clash the first operator in marshalled_operators wins
+        """
+        marshalled_operators = self.marshalled_operators
+        if self._operators_by_type is None:
+            by_type = {}
+            for operator in marshalled_operators:
+                by_type.setdefault(operator["type"], operator)
+            self._operators_by_type = by_type
+        return self._operators_by_type
+
+    def get_marshalled_operator(self, operator_type: str):
+        """Returns a copy of the marshalled operator for a given type
+
+        Args:
+            operator_type (str): Name of the operator class
+
+        Returns:
+            Dict: Marshalled operator, or None if the type isn't indexed
+        """
+        operator = self.operators_by_type.get(operator_type)
+        if not operator and self.refresh_custom_operators():
+            operator = self.operators_by_type.get(operator_type)
+        return copy_marshalled_operator(operator) if operator else None
+
+    def load_marshalled_operators(self):
+        """Loads the marshalled operator list from the cache if it is still valid,
+        otherwise rebuilds it and refreshes the cache
+
+        Returns:
+            List[Dict]: See OperatorIndex.marshall_operator_list
+        """
+        if not self.cache:
+            return self.marshall_operator_list()
+
+        key = self.cache.cache_key()
+        marshalled_operators = self.cache.load(key)
+        if marshalled_operators is None:
+            logging.info("Rebuilding operator index")
+            marshalled_operators = self.marshall_operator_list()
+            self.cache.save(key, marshalled_operators)
+        return marshalled_operators
+
     def marshall_operator(self, operator):
-        return OperatorHandler.from_operator(operator).dump()
+        """Returns a copy of the marshalled operator for a given class. Classes
+        are only parsed the first time they're requested
+
+        Args:
+            operator (BaseOperator): Airflow Operator Class
+
+        Returns:
+            Dict: Marshalled operator
+        """
+        if operator not in self._operators_by_class:
+            self._operators_by_class[operator] = OperatorHandler.from_operator(
+                operator
+            ).dump()
+        return copy_marshalled_operator(self._operators_by_class[operator])
 
     def marshall_operator_list(self):
         """Return a JSON marshalled list of Operators as per OperatorHandler schema
@@ -41,6 +173,9 @@ class OperatorIndex:
         Returns:
             List[Dict]: List of OperatorHandler Dict - see `schemas.app_schemas.OperatorSchema`
         """
+        if self.processes:
+            return self.marshall_default_operators_parallel(self.processes)
+
         handlers = []
         for operator in self.operator_list:
             try:
@@ -50,39 +185,111 @@ class OperatorIndex:
 
         return [h.dump() for h in handlers]
 
+    @staticmethod
+    def marshall_default_operators_parallel(processes: int):
+        """Imports and marshalls each module under airflow.operators on a pool of
+        worker processes. The merged result is identical to marshall_operator_list
+
+        Args:
+            processes (int): Number of worker processes
+
+        Returns:
+            List[Dict]: List of OperatorHandler Dict - see `schemas.app_schemas.OperatorSchema`
+        """
+        modnames = [m for _, m, _ in pkgutil.iter_modules(operators.__path__)]
+
+        marshalled = {}
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            for res in executor.map(_marshall_operator_module, modnames):
+                marshalled.update(res)
+
+        return [op for _, op in sorted(marshalled.items()) if op is not None]
+
     def get_operators(self):
-        """Get all default and custom operators
+        """Get all default operators. Custom operators are indexed separately -
+        see CustomOperatorIndex
         
         Returns:
             List[Operator]: List of classes that inherit from BaseOperator
         """
         return self.get_default_operators()
 
+    @staticmethod
+    def get_module_operators(modname: str):
+        """Imports airflow.operators.{modname} and returns every class in it that
+        inherits from the BaseOperator class
+
+        Args:
+            modname (str): Module name, relative to airflow.operators
+
+        Returns:
+            Set[Operator]: Set of Operator classes
+        """
+        try:
+            mod = import_module(f"airflow.operators.{modname}")
+        except (ModuleNotFoundError, SyntaxError) as e:
+            # NOTE Some of the HDFS libraries in Airflow don't support Python 3
+            logging.info(f"Unable to import operator from {modname}: {e}")
+            return set()
+
+        return {
+            v
+            for v in mod.__dict__.values()
+            if inspect.isclass(v) and issubclass(v, operators.BaseOperator)
+        }
+
     @staticmethod
     def get_default_operators():
         """Scrapes operators module for all classes that inherit from the BaseOperator
         class
         
         Returns:
-            List[Operator]: List of Operator classes
+            List[Operator]: List of Operator classes, sorted by module and name
         """
         ops = set()
         for _, modname, _ in pkgutil.iter_modules(operators.__path__):
-            try:
-                mod = import_module(f"airflow.operators.{modname}")
-            except (ModuleNotFoundError, SyntaxError) as e:
-                # NOTE Some of the HDFS libraries in Airflow don't support Python 3
-                logging.info(f"Unable to import operator from {modname}: {e}")
+            ops = ops.union(OperatorIndex.get_module_operators(modname))
 
-            ops = ops.union(
-                {
-                    v
-                    for v in mod.__dict__.values()
-                    if inspect.isclass(v) and issubclass(v, operators.BaseOperator)
-                }
-            )
+        return sorted(ops, key=_operator_sort_key)
 
-        return list(ops)
+
+def copy_marshalled_operator(operator: dict) -> dict:
+    """Copies a marshalled operator so that its properties and parameters can be
+    modified. Parameter values are immutable after marshalling so this is cheaper
+    than a deepcopy
+
+    Args:
+        operator (dict): Marshalled operator - see `schemas.app_schemas.OperatorSchema`
+
+    Returns:
+        Dict: Copy of operator
+    """
+    properties = dict(operator["properties"])
+    properties["parameters"] = [dict(p) for p in properties["parameters"]]
+    return {**operator, "properties": properties}
+
+
+def _operator_sort_key(operator):
+    return operator.__module__, operator.__qualname__
+
+
+def _marshall_operator_module(modname: str):
+    """Worker for OperatorIndex.marshall_default_operators_parallel
+
+    Returns:
+        Dict: Mapping of operator sort key to marshalled operator, or None if the
+              operator couldn't be marshalled
+    """
+    res = {}
+    for operator in OperatorIndex.get_module_operators(modname):
+        try:
+            res[_operator_sort_key(operator)] = OperatorHandler.from_operator(
+                operator
+            ).dump()
+        except OperatorMarshallError as e:
+            logging.exception(f"Unable to parse operator {operator.__name__}: {e}")
+            res[_operator_sort_key(operator)] = None
+    return res
 
 
 _operator_index: OperatorIndex = None
@@ -94,3 +301,35 @@ def get_operator_index() -> OperatorIndex:
     if not _operator_index:
         _operator_index = OperatorIndex()
     return _operator_index
+
+
+def init_operator_index(
+    cache_file=None, processes=0, custom_operators=""
+) -> OperatorIndex:
+    """Replaces the global operator index, unless the existing index is already
+    configured with the same arguments
+
+    Args:
+        cache_file (str, optional): See OperatorIndex
+        processes (int, optional): See OperatorIndex
+        custom_operators (str, optional): See OperatorIndex
+
+    Returns:
+        OperatorIndex: The global operator index
+    """
+    global _operator_index
+
+    if _operator_index:
+        cache = _operator_index.cache
+        current = (
+            (cache and cache.cache_file),
+            _operator_index.processes,
+            _operator_index.custom_operators,
+        )
+    if not _operator_index or current != (cache_file, processes, custom_operators):
+        _operator_index = OperatorIndex(
+            custom_operators=custom_operators,
+            cache_file=cache_file,
+            processes=processes,
+        )
+    return _operator_index
@@ -0,0 +1,192 @@
+import functools
+from typing import Dict, List
+
+from marshmallow import EXCLUDE, INCLUDE, RAISE, Schema, fields, missing
+from marshmallow.decorators import POST_LOAD, PRE_LOAD, VALIDATES, VALIDATES_SCHEMA
+from marshmallow.exceptions import ValidationError
+
+__all__ = ["CompiledSchema", "compiled_schema"]
+
+_LOAD_PROCESSORS = (PRE_LOAD, POST_LOAD, VALIDATES_SCHEMA)
+
+
+class _Fallback(Exception):
+    """Raised by the fast path when a value needs marshmallow to load it"""
+
+
+def _has_load_hooks(schema: Schema) -> bool:
+    return bool(schema._hooks.get(VALIDATES)) or any(
+        schema._has_processors(tag) for tag in _LOAD_PROCESSORS
+    )
+
+
+def _compile_field(field: fields.Field):
+    """Returns a function that loads a present value for field. Common cases -
+    values that are already of the field's type - are handled directly, everything
+    else is passed to the field itself
+    """
+    name = field.name
+
+    def generic(value):
+        try:
+            return field.deserialize(value, name)
+        except ValidationError as e:
+            raise _Fallback() from e
+
+    if field.validators:
+        return generic
+
+    allow_none = field.allow_none
+    if type(field) is fields.Str:
+        exact = str
+    elif type(field) is fields.Int:
+        exact = int
+    elif type(field) is fields.Bool:
+        exact = bool
+    elif type(field) is fields.Nested:
+        if field.many:
+            return generic
+        load_nested = _compile_schema(field.schema, field.unknown)
+
+        def nested(value):
+            if value is None and allow_none:
+                return None
+            return load_nested(value)
+
+        return nested
+    elif type(field) is fields.List:
+        load_item = _compile_field(field.inner)
+
+        def list_field(value):
+            if type(value) is not list:
+                return generic(value)
+            return [load_item(item) for item in value]
+
+        return list_field
+    elif type(field) is fields.Dict:
+        load_key = _compile_field(field.key_field) if field.key_field else None
+        load_value = _compile_field(field.value_field) if field.value_field else None
+
+        def dict_field(value):
+            if type(value) is not dict:
+                return generic(value)
+            if load_key:
+                keys = [load_key(k) for k in value]
+            else:
+                keys = list(value)
+            if load_value:
+                values = [load_value(v) for v in value.values()]
+            else:
+                values = list(value.values())
+            return dict(zip(keys, values))
+
+        return dict_field
+    else:
+        return generic
+
+    def exact_type(value):
+        if type(value) is exact or (value is None and allow_none):
+            return value
+        return generic(value)
+
+    return exact_type
+
+
+def _compile_schema(schema: Schema, unknown: str = None):
+    """Returns a function that loads a dict with schema"""
+    unknown = unknown or schema.unknown
+    if _has_load_hooks(schema):
+
+        def hooked(data):
+            try:
+                return schema.load(data, unknown=unknown)
+            except ValidationError as e:
+                raise _Fallback() from e
+
+        return hooked
+
+    loaders = []
+    for attr_name, field in schema.load_fields.items():
+        data_key = field.data_key if field.data_key is not None else attr_name
+        attribute = field.attribute or attr_name
+        loaders.append((data_key, attribute, field, _compile_field(field)))
+    data_keys = {data_key for data_key, *_ in loaders}
+
+    def load(data):
+        if type(data) is not dict:
+            raise _Fallback()
+        out = {}
+        for data_key, attribute, field, load_value in loaders:
+            value = data.get(data_key, missing)
+            if value is missing:
+                try:
+                    value = field.deserialize(missing)
+                except ValidationError as e:
+                    raise _Fallback() from e
+                if value is missing:
+                    continue
+            else:
+                value = load_value(value)
+            out[attribute] = value
+
+        if unknown != EXCLUDE:
+            extra = data.keys() - data_keys
+            if extra and unknown == RAISE:
+                raise _Fallback()
+            if extra and unknown == INCLUDE:
+                out.update((k, v) for k, v in data.items() if k in extra)
+        return out
+
+    return load
+
+
+class CompiledSchema:
+    def __init__(self, schema: Schema):
+        """Fast loader for a marshmallow schema. The schema's fields are walked
+        once, into a tree of plain functions that check and copy valid documents
+        without marshmallow's per-field bookkeeping. Anything the fast path isn't
+        sure of is loaded by the schema itself, so results and ValidationErrors are
+        the same as schema.load
+
+        Args:
+            schema (Schema): Schema instance. Nested schemas use their own settings
+        """
+        self.schema = schema
+        self._loaders = {}
+
+    def _loader(self, unknown):
+        if unknown not in self._loaders:
+            self._loaders[unknown] = _compile_schema(self.schema, unknown)
+        return self._loaders[unknown]
+
+    def load(self, data, unknown: str = None) -> Dict:
+        """Equivalent to schema.load(data, unknown=unknown)
+
+        Raises:
+            ValidationError: If data is invalid
+        """
+        try:
+            return self._loader(unknown)(data)
+        except _Fallback:
+            return self.schema.load(data, unknown=unknown)
+
+    def load_many(self, data: List, unknown: str = None) -> List[Dict]:
+        """Loads a list of documents. Equivalent to loading each in turn
+
+        Raises:
+            ValidationError: For the first invalid document
+        """
+        load = self._loader(unknown)
+        res = []
+        for item in data:
+            try:
+                res.append(load(item))
+            except _Fallback:
+                res.append(self.schema.load(item, unknown=unknown))
+        return res
+
+
+@functools.lru_cache(maxsize=None)
+def compiled_schema(schema_cls) -> CompiledSchema:
+    """Per-process CompiledSchema for a schema class, built on first use"""
+    return CompiledSchema(schema_cls())
@@ -1,2 +1,3 @@
+# run, compile, build, import_dags and watch import Airflow, so the CLI imports
+# them from their modules when a command is invoked
 from .init import CreateProject
-from .run import RunConfig
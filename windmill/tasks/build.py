@@ -0,0 +1,160 @@
+import hashlib
+import json
+import logging
+import os
+import time
+
+from .. import __version__ as windmill_version
+from ..config.build_config import BuildConfig
+from ..utils.file_utils import write_atomic
+from ..utils.import_handler import add_import_path, import_airflow
+
+
+def airflow_version() -> str:
+    """Installed Airflow version, read from package metadata so that Airflow
+    isn't imported
+
+    Returns:
+        str: Version, or None if Airflow isn't installed
+    """
+    try:
+        try:
+            from importlib.metadata import version
+        except ImportError:  # Python < 3.8
+            from pkg_resources import get_distribution
+
+            return get_distribution("apache-airflow").version
+        return version("apache-airflow")
+    except Exception:
+        return None
+
+
+def load_manifest(filename: str) -> dict:
+    try:
+        with open(filename, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+class BuildProject:
+    def __init__(self, conf: BuildConfig):
+        """Compiles each WML in the project that changed since the last build, on
+        a process pool, and removes DAGs whose WML was deleted. The manifest of
+        the last build is stored in the project cache - WMLs are only re-read if
+        their mtime or size changed, and only recompiled if their content hash
+        changed. Changing Windmill, Airflow or codegen_backend rebuilds everything
+
+        Args:
+            conf (BuildConfig): Build config object
+        """
+        start = time.perf_counter()
+        proj = conf.project_conf
+        workers = os.cpu_count() if conf.workers is None else conf.workers
+
+        versions = {
+            "windmill": windmill_version,
+            "airflow": airflow_version(),
+            "codegen_backend": conf.codegen_backend,
+        }
+        manifest = load_manifest(proj.build_manifest_file)
+        built_before = manifest.get("wmls", {})
+        previous = built_before if manifest.get("versions") == versions else {}
+
+        entries = {}
+        to_build = []
+        with os.scandir(proj.wml_dir) as it:
+            for entry in it:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+                current = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+                old = previous.get(entry.name)
+                if old and not os.path.exists(
+                    os.path.join(proj.dags_dir, old["dag_file"])
+                ):
+                    old = None
+                if old and all(old[k] == v for k, v in current.items()):
+                    entries[entry.name] = old
+                    continue
+
+                with open(entry.path, "rb") as f:
+                    current["hash"] = hashlib.sha256(f.read()).hexdigest()
+                if old and old["hash"] == current["hash"]:
+                    entries[entry.name] = {**old, **current}
+                else:
+                    to_build.append((entry.name, entry.path, current))
+
+        self.unchanged = sorted(entries)
+        self.built, self.failed = [], []
+        if to_build:
+            results = self._compile(conf, workers, to_build)
+            for res, (name, _, current) in zip(results, to_build):
+                if res["error"]:
+                    self.failed.append(res)
+                    # Keep track of its last DAG, but rebuild it next time
+                    old = built_before.get(name)
+                    if old:
+                        entries[name] = {**old, "mtime_ns": None, "hash": None}
+                else:
+                    self.built.append(res)
+                    entries[name] = {**current, "dag_file": res["dag_file"]}
+
+        # Remove DAGs that are no longer produced by any WML
+        self.removed = []
+        dag_files = {e["dag_file"] for e in entries.values()}
+        for name, old in built_before.items():
+            if old["dag_file"] not in dag_files:
+                dag_files.add(old["dag_file"])
+                try:
+                    os.remove(os.path.join(proj.dags_dir, old["dag_file"]))
+                    self.removed.append(old["dag_file"])
+                except FileNotFoundError:
+                    pass
+
+        os.makedirs(proj.cache_dir, exist_ok=True)
+        write_atomic(
+            proj.build_manifest_file,
+            json.dumps({"versions": versions, "wmls": entries}, sort_keys=True),
+        )
+        self.duration = time.perf_counter() - start
+        self.report()
+
+    @staticmethod
+    def _compile(conf: BuildConfig, workers: int, to_build):
+        # Only import Airflow and the DAG models if there's something to build
+        import_airflow()
+        from ..models.dags.dag_compiler import compile_wmls, init_compile_pool
+        from ..models.dags.dag_handler import DagHandler
+        from ..utils.render_cache import init_render_cache
+
+        DagHandler.set_codegen_backend(conf.codegen_backend)
+
+        proj = conf.project_conf
+        init_render_cache(cache_dir=proj.render_cache_dir)
+        add_import_path(proj.operators_dir)
+        logging.info(f"Building {len(to_build)} WMLs on {workers} processes")
+        init_compile_pool(processes=workers if len(to_build) > 1 else 0)
+        try:
+            return compile_wmls(
+                [(name, None) for name, _, _ in to_build],
+                proj.dags_dir,
+                wml_dir=proj.wml_dir,
+            )
+        finally:
+            init_compile_pool()
+
+    def report(self):
+        for res in self.failed:
+            timing = f"({res['duration']:.2f}s)"
+            print(f"FAILED  {res['name']} {timing}: {res['error']}")
+        for res in self.built:
+            timing = f"({res['duration']:.2f}s)"
+            print(f"BUILT   {res['name']} -> {res['dag_file']} {timing}")
+        for dag_file in self.removed:
+            print(f"REMOVED {dag_file}")
+        print(
+            f"Built {len(self.built)}, unchanged {len(self.unchanged)}, "
+            f"failed {len(self.failed)}, removed {len(self.removed)} "
+            f"in {self.duration:.2f}s"
+        )
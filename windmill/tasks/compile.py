@@ -0,0 +1,47 @@
+import os
+import time
+
+from ..config.compile_config import CompileConfig
+from ..models.dags.dag_compiler import compile_wmls, init_compile_pool
+from ..models.dags.dag_handler import DagHandler
+from ..utils.import_handler import add_import_path
+from ..utils.render_cache import init_render_cache
+
+
+class CompileDags:
+    def __init__(self, conf: CompileConfig):
+        """Compiles WMLs in a project and prints the result for each
+
+        Args:
+            conf (CompileConfig): Compile config object
+
+        Raises:
+            ValueError: If the code generation backend is unknown
+        """
+        DagHandler.set_codegen_backend(conf.codegen_backend)
+
+        proj = conf.project_conf
+        init_render_cache(cache_dir=proj.render_cache_dir)
+        add_import_path(proj.operators_dir)
+
+        names = conf.wml_list or sorted(os.listdir(proj.wml_dir))
+
+        start = time.perf_counter()
+        init_compile_pool(processes=conf.workers if len(names) > 1 else 0)
+        try:
+            self.results = compile_wmls(
+                [(name, None) for name in names], proj.dags_dir, wml_dir=proj.wml_dir
+            )
+        finally:
+            init_compile_pool()
+        duration = time.perf_counter() - start
+
+        for res in self.results:
+            timing = f"({res['duration']:.2f}s)"
+            if res["error"]:
+                print(f"FAILED  {res['name']} {timing}: {res['error']}")
+            else:
+                print(f"OK      {res['name']} -> {res['dag_file']} {timing}")
+
+        compiled = sum(1 for res in self.results if not res["error"])
+        print(f"Compiled {compiled}/{len(self.results)} WMLs in {duration:.2f}s")
@@ -0,0 +1,38 @@
+import os
+import time
+
+from ..config.import_config import ImportConfig
+from ..models.dags.dag_importer import import_dag_files
+
+
+class ImportDags:
+    def __init__(self, conf: ImportConfig):
+        """Converts Python DAG files in a project to WMLs and prints the result
+        for each
+
+        Args:
+            conf (ImportConfig): Import config object
+        """
+        proj = conf.project_conf
+        workers = conf.workers or os.cpu_count()
+
+        pyfiles = conf.dag_list or sorted(
+            f for f in os.listdir(proj.dags_dir) if f.endswith(".py")
+        )
+
+        start = time.perf_counter()
+        self.results = import_dag_files(
+            pyfiles, proj, processes=workers, timeout=conf.timeout
+        )
+        duration = time.perf_counter() - start
+
+        for res in self.results:
+            timing = f"({res['duration']:.2f}s)"
+            if res["error"]:
+                print(f"FAILED  {res['name']} {timing}: {res['error']}")
+            else:
+                wml_files = ", ".join(res["wml_files"]) or "no DAGs found"
+                print(f"OK      {res['name']} -> {wml_files} {timing}")
+
+        imported = sum(1 for res in self.results if not res["error"])
+        print(f"Imported {imported}/{len(self.results)} DAG files in {duration:.2f}s")
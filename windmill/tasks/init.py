@@ -31,6 +31,7 @@ class CreateProject:
         mkdir(join(proj.name, proj.wml_dir))
         mkdir(join(proj.name, proj.dags_dir))
         mkdir(join(proj.name, proj.operators_dir))
+        mkdir(join(proj.name, proj.cache_dir))
 
         logging.info(f"Creating project config file '{proj.conf_file}'")
         proj.to_config_file(join(proj.name, proj.conf_file))
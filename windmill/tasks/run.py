@@ -1,9 +1,109 @@
+import logging
+
 from ..config.run_config import RunConfig
 from ..http.api.endpoints import build_app
+from ..models.dags.dag_compiler import init_compile_pool
+from ..models.dags.dag_handler import DagHandler
+from ..models.operators.operator_index import get_operator_index
+from ..utils.validation_pool import init_validation_pool
+
+
+def import_gunicorn_base():
+    """Returns Gunicorn's BaseApplication
+
+    Raises:
+        ImportError: If Gunicorn isn't installed, naming the extra that installs it
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError as e:
+        raise ImportError(
+            "Gunicorn is required to run with --server-workers. Install it with "
+            "the gunicorn extra: pip install 'airflow-windmill[gunicorn]'"
+        ) from e
+    return BaseApplication
 
 
 class StartWebserver:
     def __init__(self, conf: RunConfig):
-        app = build_app(conf.project_conf, dev_server=conf.run_dev_server)
+        """Serves the app on Flask's development server, or on Gunicorn if
+        conf.server_workers is set
+
+        Args:
+            conf (RunConfig): Run config object
+
+        Raises:
+            ImportError: If server_workers is set but Gunicorn isn't installed
+        """
+        production = conf.server_workers and not conf.run_dev_server
+        if production:
+            import_gunicorn_base()  # Fail before paying for build_app
+
+        app = build_app(
+            conf.project_conf,
+            dev_server=conf.run_dev_server,
+            index_workers=conf.index_workers,
+            render_cache_size=conf.render_cache_size,
+            render_cache_disk_size=conf.render_cache_disk_size,
+            codegen_backend=conf.codegen_backend,
+            # Worker pools can't be shared across forks - see gunicorn_app
+            validation_workers=0 if production else conf.validation_workers,
+            validation_timeout=conf.validation_timeout,
+            validation_memory_mb=conf.validation_memory_mb,
+            validation_max_jobs=conf.validation_max_jobs,
+            compile_workers=0 if production else conf.compile_workers,
+            wml_cache_size=conf.wml_cache_size,
+        )
+
+        if production:
+            self.run_gunicorn(app, conf)
+        else:
+            app.run(host=conf.hostname, port=conf.port)
+
+    @classmethod
+    def run_gunicorn(cls, app, conf: RunConfig):
+        # Built before forking so that workers share them copy-on-write
+        logging.info("Building operator index")
+        get_operator_index().encoded_operators
+        DagHandler.encoded_dag_docstring()
+
+        cls.gunicorn_app(app, conf).run()
+
+    @staticmethod
+    def gunicorn_app(app, conf: RunConfig):
+        """Gunicorn application serving app, preloaded so that workers are forked
+        from this process. Each worker starts its own validation and compile pools
+        after the fork
+
+        Raises:
+            ImportError: If Gunicorn isn't installed
+        """
+        BaseApplication = import_gunicorn_base()
+
+        def _post_fork(server, worker):
+            limits = dict(
+                timeout=conf.validation_timeout,
+                memory_limit_mb=conf.validation_memory_mb or None,
+                max_jobs_per_worker=conf.validation_max_jobs,
+            )
+            init_validation_pool(processes=conf.validation_workers, **limits)
+            init_compile_pool(processes=conf.compile_workers, **limits)
+
+        class GunicornServer(BaseApplication):
+            def load_config(self):
+                options = {
+                    "bind": f"{conf.hostname}:{conf.port}",
+                    "workers": conf.server_workers,
+                    "threads": conf.server_threads,
+                    "keepalive": conf.keep_alive,
+                    "timeout": conf.request_timeout,
+                    "preload_app": True,
+                    "post_fork": _post_fork,
+                }
+                for key, value in options.items():
+                    self.cfg.set(key, value)
+
+            def load(self):
+                return app
 
-        app.run(host=conf.hostname, port=conf.port)
+        return GunicornServer()
@@ -0,0 +1,60 @@
+import os
+import time
+
+from ..config.watch_config import WatchConfig
+from ..models.dags.dag_compiler import compile_wml
+from ..models.dags.dag_handler import DagHandler
+from ..utils.import_handler import add_import_path
+from ..utils.render_cache import init_render_cache
+from ..utils.wml_watcher import WmlWatcher
+
+
+class WatchProject:
+    def __init__(self, conf: WatchConfig):
+        """Recompiles WMLs in a project as they change, printing the compile time
+        and the latency from the change being seen to the DAG being written.
+        Runs until interrupted
+
+        Args:
+            conf (WatchConfig): Watch config object
+
+        Raises:
+            ValueError: If the code generation backend is unknown
+        """
+        DagHandler.set_codegen_backend(conf.codegen_backend)
+
+        self.proj = conf.project_conf
+        init_render_cache(cache_dir=self.proj.render_cache_dir)
+        add_import_path(self.proj.operators_dir)
+
+        self.watcher = WmlWatcher(
+            self.proj.wml_dir,
+            self.compile_changes,
+            debounce=conf.debounce_ms / 1000,
+            poll_interval=conf.poll_interval_ms / 1000,
+        )
+        mode = "notifications" if self.watcher.notifications else "polling"
+        print(f"Watching {self.proj.wml_dir} ({mode}) - press Ctrl+C to stop")
+        try:
+            self.watcher.run()
+        except KeyboardInterrupt:
+            pass
+
+    def compile_changes(self, changes):
+        for name, seen in sorted(changes.items()):
+            path = os.path.join(self.proj.wml_dir, name)
+            if not os.path.exists(path):
+                print(f"DELETED {name}")
+                continue
+
+            res = compile_wml(name, None, self.proj.dags_dir, self.proj.wml_dir)
+            timing = (
+                f"(compile {res['duration']:.2f}s, "
+                f"latency {time.monotonic() - seen:.2f}s)"
+            )
+            if res["error"]:
+                print(f"FAILED  {name} {timing}: {res['error']}")
+            elif res["dag_changed"]:
+                print(f"OK      {name} -> {res['dag_file']} {timing}")
+            else:
+                print(f"NOOP    {name} -> {res['dag_file']} unchanged {timing}")
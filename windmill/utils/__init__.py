@@ -1 +1 @@
-from . import class_parser
+# class_parser imports Airflow, so it is imported from its module where needed
@@ -1,7 +1,9 @@
 import inspect
 import logging
 import re
+import weakref
 from copy import deepcopy
+from typing import Callable, Dict, List, Tuple
 
 from docstring_parser import parse
 
@@ -13,6 +15,74 @@ from ..models.schemas.app_schemas import (
 )
 
 
+_TYPE_RE = re.compile(r":type (.*): (.*)")
+# Section titles that make docstring_parser prefer its Google style parser
+_GOOGLE_TITLE_RE = re.compile(
+    r"(Arguments|Args|Parameters|Params|Raises|Exceptions|Except|Attributes"
+    r"|Example|Examples|Returns|Yields):"
+)
+_PARAM_KEYS = {"param", "parameter", "arg", "argument", "key", "keyword"}
+
+
+class _Unsupported(Exception):
+    """Raised by ClassParser.tokenize_docstring for docstrings it can't parse
+    exactly like fix_docstring and docstring_parser
+    """
+
+
+def copy_class_props(props: Dict) -> Dict:
+    """Copies class properties deeply enough that callers can set parameter
+    fields, while sharing descriptions and defaults with the original. Cheaper
+    than a deepcopy
+    """
+    return {**props, "parameters": [dict(p) for p in props["parameters"]]}
+
+
+class ClassSpecCache:
+    def __init__(self):
+        """Process-wide cache of parsed class specs, keyed by class identity.
+        Classes are weakly referenced, so reloaded custom operators don't leak
+        """
+        self._specs = weakref.WeakKeyDictionary()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, cls, key, build: Callable):
+        """Returns a copy of the spec for cls and key, calling build() to create
+        it the first time it's requested
+
+        Args:
+            cls (Class): Parsed class
+            key (Hashable): Parse options
+            build (Callable): Returns [class name, properties dict]
+
+        Returns:
+            list: [class name, copy of properties dict]
+        """
+        specs = self._specs.setdefault(cls, {})
+        if key in specs:
+            self.hits += 1
+        else:
+            self.misses += 1
+            specs[key] = build()
+        name, props = specs[key]
+        return name, copy_class_props(props)
+
+    def stats(self) -> Dict:
+        return {"hits": self.hits, "misses": self.misses, "classes": len(self._specs)}
+
+    def clear(self):
+        self._specs.clear()
+        self.hits = self.misses = 0
+
+
+_class_spec_cache = ClassSpecCache()
+
+
+def get_class_spec_cache() -> ClassSpecCache:
+    return _class_spec_cache
+
+
 class ClassParser:
     @classmethod
     def fix_types(cls, typ: str):
@@ -64,6 +134,97 @@ class ClassParser:
             docs = docs.replace(f":param {param}:", f":param {typ} {param}:")
         return docs
 
+    @classmethod
+    def parse_docstring(cls, docs: str) -> Tuple[str, str, List[Tuple]]:
+        """Parses an Airflow docstring - equivalent to parsing
+        fix_docstring(docs) with docstring_parser, but in a single pass
+
+        Args:
+            docs (str): Airflow docstring
+
+        Returns:
+            Tuple[str, str, List[Tuple]]: short description, long description and
+                (name, type, description) for each parameter
+        """
+        try:
+            return cls.tokenize_docstring(docs)
+        except _Unsupported:
+            parsed = parse(cls.fix_docstring(docs))
+            return (
+                parsed.short_description,
+                parsed.long_description,
+                [(p.arg_name, p.type_name, p.description) for p in parsed.params],
+            )
+
+    @classmethod
+    def tokenize_docstring(cls, docs: str) -> Tuple[str, str, List[Tuple]]:
+        """Splits a docstring into its description and `:field args: text` chunks
+        line by line, following docstring_parser's ReST rules, with `:type:`
+        fields applied to `:param:` chunks as fix_docstring would
+
+        Raises:
+            _Unsupported: If the docstring uses constructs that fix_docstring's
+                text replacement or docstring_parser's style detection could
+                treat differently - see parse_docstring
+        """
+        if "\t" in docs:  # Tabs are expanded by cleandoc but not by fix_docstring
+            raise _Unsupported()
+
+        desc_lines, chunks, types = [], [], []
+        for line in inspect.cleandoc(docs).split("\n"):
+            if ":type " in line:
+                match = _TYPE_RE.search(line)
+                if match:
+                    param, typ = match.groups()
+                    if ":" in param or param != "".join(param.split()):
+                        raise _Unsupported()
+                    types.append((param, typ))
+            if line.find(":param ", 1) != -1:
+                raise _Unsupported()
+
+            if line.startswith(":"):
+                args_chunk = line[1:].split(":", 1)
+                if len(args_chunk) < 2 or not args_chunk[0].split():
+                    raise _Unsupported()
+                chunks.append([line])
+            elif _GOOGLE_TITLE_RE.match(line):
+                raise _Unsupported()
+            elif chunks:
+                chunks[-1].append(line)
+            else:
+                desc_lines.append(line)
+
+        param_types = {}
+        for param, typ in types:
+            typ = cls.fix_types(typ)
+            if not validate_parameter_type(typ) or not typ:
+                logging.warning(f"Unable to parse field {typ}")
+                typ = "str"
+            param_types.setdefault(param, typ)
+
+        desc_chunk = "\n".join(desc_lines) + ("\n" if desc_lines and chunks else "")
+        parts = desc_chunk.split("\n", 1)
+        short_description = parts[0] or None
+        long_description = parts[1].strip() or None if len(parts) > 1 else None
+
+        params = []
+        for chunk in chunks:
+            args_chunk, desc = "\n".join(chunk)[1:].split(":", 1)
+            args = args_chunk.split()
+            if args[0] not in _PARAM_KEYS:
+                continue
+            if args_chunk.startswith("param ") and args_chunk[6:] in param_types:
+                args = ["param", param_types[args_chunk[6:]]] + args[1:]
+
+            desc = desc.strip()
+            if "\n" in desc:
+                first_line, rest = desc.split("\n", 1)
+                desc = first_line + "\n" + inspect.cleandoc(rest)
+            name = args[2] if len(args) > 2 else args[1] if len(args) > 1 else None
+            params.append((name, args[1] if len(args) > 2 else None, desc))
+
+        return short_description, long_description, params
+
     @staticmethod
     def _parse_class_docstring(cls, inherited):
         doc_string = cls.__doc__
@@ -74,23 +235,20 @@ class ClassParser:
             print("hello")
 
         if doc_string:
-            fixed_docs = ClassParser.fix_docstring(doc_string)
-            docs = parse(fixed_docs)
+            short, long, params = ClassParser.parse_docstring(doc_string)
             return [
                 cls.__name__,
                 {
                     "module": cls.__module__,
-                    "description": "\n".join(
-                        (docs.short_description or "", docs.long_description or "")
-                    ),
+                    "description": "\n".join((short or "", long or "")),
                     "parameters": [
                         {
-                            "id": p.arg_name,
-                            "type": p.type_name or "str",
-                            "description": p.description,
+                            "id": name,
+                            "type": typ or "str",
+                            "description": description,
                             "inheritedFrom": cls.__name__ if inherited else None,
                         }
-                        for p in docs.params
+                        for name, typ, description in params
                     ],
                 },
             ]
@@ -100,7 +258,8 @@ class ClassParser:
     @staticmethod
     def parse_class(cls, inherit_until=None, inherited=False):
         """Parses class docstrings and parent classes to get class properties
-        This will add default values from the func definition as well
+        This will add default values from the func definition as well. Classes
+        are only parsed once per process - see ClassSpecCache
         
         Args:
             cls (Class): The class to parse
@@ -111,6 +270,14 @@ class ClassParser:
         Returns:
             list: [class name, properties dict]
         """
+        return _class_spec_cache.get(
+            cls,
+            (inherit_until, inherited),
+            lambda: ClassParser._parse_class(cls, inherit_until, inherited),
+        )
+
+    @staticmethod
+    def _parse_class(cls, inherit_until, inherited):
         name, props = ClassParser._parse_class_docstring(cls, inherited)
 
         # Get default parameter values from class
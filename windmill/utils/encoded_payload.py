@@ -0,0 +1,57 @@
+import gzip
+import hashlib
+import io
+import json
+
+try:
+    import brotli
+except ImportError:  # Optional - responses are gzipped only
+    brotli = None
+
+
+class EncodedPayload:
+    def __init__(self, body: bytes):
+        """A response body encoded once, with pre-compressed variants and a
+        strong ETag per variant
+
+        Args:
+            body (bytes): Uncompressed body
+        """
+        digest = hashlib.sha256(body).hexdigest()[:32]
+
+        self.variants = {"identity": body, "gzip": _gzip(body)}
+        if brotli:
+            self.variants["br"] = brotli.compress(body, quality=11)
+        self.etags = {
+            encoding: digest if encoding == "identity" else f"{digest}-{encoding}"
+            for encoding in self.variants
+        }
+
+    @classmethod
+    def from_json(cls, obj) -> "EncodedPayload":
+        """Encodes a JSON serialisable object with sorted keys, so equal objects
+        have equal ETags
+        """
+        return cls(json.dumps(obj, sort_keys=True, separators=(",", ":")).encode())
+
+    def encoding_for(self, accepts) -> str:
+        """Picks the smallest variant accepted by the client
+
+        Args:
+            accepts (Callable[[str], bool]): Whether the client accepts an encoding
+
+        Returns:
+            str: One of EncodedPayload.variants
+        """
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and accepts(encoding):
+                return encoding
+        return "identity"
+
+
+def _gzip(body: bytes) -> bytes:
+    # mtime=0 so that the compressed bytes only depend on the body
+    buf = io.BytesIO()
+    with gzip.GzipFile(fileobj=buf, mode="wb", compresslevel=9, mtime=0) as f:
+        f.write(body)
+    return buf.getvalue()
@@ -0,0 +1,61 @@
+import os
+import tempfile
+
+
+def is_plain_filename(name: str) -> bool:
+    """True if name is a file name with no directory parts, so that joining it
+    to a folder can't escape that folder
+    """
+    return bool(name) and os.path.basename(name) == name and name not in (".", "..")
+
+
+def resolve_in_dir(folder: str, name: str) -> str:
+    """Resolves name relative to folder, following symlinks
+
+    Args:
+        folder (str): Folder name must be in
+        name (str): Relative file name
+
+    Returns:
+        str: Real path of the file, or None if it isn't inside folder
+    """
+    root = os.path.realpath(folder)
+    path = os.path.realpath(os.path.join(root, name))
+    if path == root or os.path.commonpath([root, path]) != root:
+        return None
+    return path
+
+
+def write_atomic(path: str, contents: str, skip_unchanged: bool = False) -> bool:
+    """Writes contents to a temp file next to path and renames it into place,
+    so readers never see a partially written file
+
+    Args:
+        path (str): Destination file
+        contents (str): File contents
+        skip_unchanged (bool, optional): If True the file isn't rewritten when it
+            already has these contents, leaving its mtime alone. Defaults to False.
+
+    Returns:
+        bool: True if the file was written
+    """
+    data = contents.encode()
+    if skip_unchanged:
+        try:
+            with open(path, "rb") as f:
+                if f.read() == data:
+                    return False
+        except OSError:
+            pass
+
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return True
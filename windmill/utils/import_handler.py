@@ -1,3 +1,4 @@
+import logging
 import os
 import sys
 import importlib
@@ -6,6 +7,22 @@ from types import ModuleType
 from ..config.project_config import ProjectConfig
 
 
+def add_import_path(path: str):
+    """Appends a folder to sys.path, as Airflow does for its DAGs and plugins
+    folders, so that DAGs can import modules from it - e.g. a project's custom
+    operators. Only that folder is added, not the project, as its other files
+    would shadow too many module names. Validation and compile workers
+    started afterwards are spawned with this process' sys.path, so they can
+    import from it too
+
+    Arguments:
+        path {str} -- Folder to import modules from
+    """
+    path = os.path.abspath(path)
+    if path not in sys.path:
+        sys.path.append(path)
+
+
 def import_str_as_module(code: str, name: str, doc: str = "") -> ModuleType:
     """Create a module from a string of Python code
 
@@ -19,7 +36,6 @@ def import_str_as_module(code: str, name: str, doc: str = "") -> ModuleType:
     Returns:
         ModuleType -- instantiated module
     """
-    # TODO - add custom operators (dont add project to path - too many name conflicts)
     module = ModuleType(name, doc)
 
     exec(code, module.__dict__)
@@ -38,7 +54,7 @@ def import_dag_from_project(pyfile: str, config: ProjectConfig) -> ModuleType:
         ModuleType -- Imported module
     """
 
-    # TODO - add custom operators (dont add project to path - too many name conflicts)
+    add_import_path(config.operators_dir)
     mod_name = f"imported_dags.{pyfile.split('.py')[0]}"
     spec = importlib.util.spec_from_file_location(
         mod_name, os.path.join(config.dags_dir, pyfile)
@@ -47,3 +63,23 @@ def import_dag_from_project(pyfile: str, config: ProjectConfig) -> ModuleType:
     spec.loader.exec_module(mod)
 
     return mod
+
+
+def import_airflow():
+    """Imports Airflow, which is only needed by commands that touch operators or
+    DAGs. Logging is disabled as Airflow is noisy on import
+
+    Raises:
+        ImportError: If Airflow isn't installed
+    """
+    logger = logging.getLogger()
+    logger.disabled = True
+    try:
+        import airflow
+    except ImportError:
+        print(
+            "Airflow must be installed for Windmill to run. To install windmill with the tested version of airflow run:\n   pip install airflow-windmill[airflow]"
+        )
+        raise
+    finally:
+        logger.disabled = False
@@ -0,0 +1,112 @@
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+
+class RenderCache:
+    def __init__(
+        self, max_entries: int = 128, cache_dir: str = None, max_disk_entries=1024
+    ):
+        """LRU cache of validated Python DAGs, keyed by DagHandler.render_key
+
+        Args:
+            max_entries (int, optional): Max number of DAGs held in memory. Defaults to 128.
+            cache_dir (str, optional): If provided DAGs are also persisted to this
+                directory, and read back on a memory miss. Defaults to None.
+            max_disk_entries (int, optional): Max number of DAGs persisted to
+                cache_dir. Least recently used files are evicted. Defaults to 1024.
+        """
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.max_disk_entries = max_disk_entries
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.py")
+
+    def get(self, key: str):
+        """Returns the cached Python for key, or None on a miss"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        if not self.cache_dir:
+            return None
+
+        try:
+            with open(self._path(key), "r") as f:
+                py_code = f.read()
+            os.utime(self._path(key))  # Mark as recently used
+        except OSError:
+            return None
+
+        self._put_memory(key, py_code)
+        return py_code
+
+    def put(self, key: str, py_code: str):
+        """Adds validated Python to the cache, evicting the least recently used
+        entries if the cache is full
+        """
+        self._put_memory(key, py_code)
+
+        if self.cache_dir:
+            try:
+                self._put_disk(key, py_code)
+            except OSError as e:
+                logging.warning(f"Unable to persist rendered DAG {key}: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _put_memory(self, key: str, py_code: str):
+        with self._lock:
+            self._entries[key] = py_code
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _put_disk(self, key: str, py_code: str):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(py_code)
+        os.replace(tmp_path, self._path(key))
+
+        with os.scandir(self.cache_dir) as it:
+            entries = [e for e in it if e.name.endswith(".py")]
+        if len(entries) > self.max_disk_entries:
+            entries.sort(key=lambda e: e.stat().st_mtime_ns)
+            for entry in entries[: len(entries) - self.max_disk_entries]:
+                os.remove(entry.path)
+
+
+_render_cache: RenderCache = None
+
+
+def get_render_cache() -> RenderCache:
+    global _render_cache
+
+    if not _render_cache:
+        _render_cache = RenderCache()
+    return _render_cache
+
+
+def init_render_cache(**kwargs) -> RenderCache:
+    """Replaces the global render cache
+
+    Args:
+        kwargs: See RenderCache
+
+    Returns:
+        RenderCache: The global render cache
+    """
+    global _render_cache
+
+    _render_cache = RenderCache(**kwargs)
+    return _render_cache
@@ -0,0 +1,63 @@
+import atexit
+
+from .import_handler import import_str_as_module
+from .worker_pool import WorkerPool
+
+
+def _import_airflow():
+    """Worker initializer - pays for the Airflow import once per worker"""
+    import airflow.models.dag
+    import airflow.operators
+
+
+def _validate(code: str, name: str):
+    """Worker job - execs the code, discarding the resulting module"""
+    import_str_as_module(code, name)
+
+
+def validate_py_code(code: str, name: str = "wml_dag"):
+    """Validates generated Python by importing it - on the validation pool if one
+    is configured, otherwise in this process
+
+    Args:
+        code (str): Python code
+        name (str, optional): Module name. Defaults to "wml_dag".
+
+    Raises:
+        Exception: Any exception raised while importing the code
+    """
+    if _validation_pool:
+        _validation_pool.run(_validate, code, name)
+    else:
+        import_str_as_module(code, name)
+
+
+_validation_pool: WorkerPool = None
+
+
+def get_validation_pool() -> WorkerPool:
+    return _validation_pool
+
+
+def init_validation_pool(processes: int = 0, **kwargs) -> WorkerPool:
+    """Replaces the global validation pool. Generated DAGs are validated
+    in-process if processes is 0
+
+    Args:
+        processes (int, optional): Number of worker processes. Defaults to 0.
+        kwargs: See WorkerPool
+
+    Returns:
+        WorkerPool: The global validation pool, or None
+    """
+    global _validation_pool
+
+    if _validation_pool:
+        _validation_pool.close()
+    _validation_pool = None
+    if processes:
+        _validation_pool = WorkerPool(processes, initializer=_import_airflow, **kwargs)
+    return _validation_pool
+
+
+atexit.register(init_validation_pool)
@@ -0,0 +1,80 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+class WmlCache:
+    def __init__(self, max_entries: int = 256):
+        """Read-through LRU cache of the raw bytes of WML files, which are
+        checked to be valid JSON when read. Entries are validated against the
+        file's mtime and size on every read so external edits are picked up
+
+        Args:
+            max_entries (int, optional): Max number of WMLs held in memory. Defaults to 256.
+        """
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_raw(self, path: str) -> bytes:
+        """Returns the contents of the WML at path, validated as JSON. The file
+        is only read on a miss
+
+        Raises:
+            OSError: If the file can't be read
+            ValueError: If the file isn't valid JSON
+        """
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and entry[0] == version:
+                self._entries.move_to_end(path)
+                return entry[1]
+
+        with open(path, "rb") as f:
+            raw = f.read()
+        json.loads(raw)
+
+        with self._lock:
+            self._entries[path] = (version, raw)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return raw
+
+    def invalidate(self, path: str):
+        with self._lock:
+            self._entries.pop(path, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_wml_cache: WmlCache = None
+
+
+def get_wml_cache() -> WmlCache:
+    global _wml_cache
+
+    if not _wml_cache:
+        _wml_cache = WmlCache()
+    return _wml_cache
+
+
+def init_wml_cache(**kwargs) -> WmlCache:
+    """Replaces the global WML cache
+
+    Args:
+        kwargs: See WmlCache
+
+    Returns:
+        WmlCache: The global WML cache
+    """
+    global _wml_cache
+
+    _wml_cache = WmlCache(**kwargs)
+    return _wml_cache
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+
+
+SORT_KEYS = ["name", "dag_id", "nodes", "links", "size", "mtime"]
+
+
+class WmlIndex:
+    def __init__(self, wml_dir: str):
+        """Metadata index of the files in a WML folder. Refreshing only stats
+        the folder - files are re-read when their mtime or size changes
+
+        Args:
+            wml_dir (str): Folder containing WML files
+        """
+        self.wml_dir = wml_dir
+
+        self._entries = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Re-scans wml_dir, re-indexing new and modified files and dropping
+        deleted ones
+        """
+        stats = {}
+        with os.scandir(self.wml_dir) as it:
+            for entry in it:
+                if entry.is_file():
+                    stat = entry.stat()
+                    stats[entry.name] = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            for name in self._entries.keys() - stats.keys():
+                del self._entries[name]
+            for name, stat in stats.items():
+                if self._stats.get(name) != stat:
+                    self._entries[name] = self._index_file(name, *stat)
+            self._stats = stats
+
+    def _index_file(self, name: str, mtime_ns: int, size: int) -> dict:
+        entry = {
+            "name": name,
+            "dag_id": None,
+            "nodes": None,
+            "links": None,
+            "size": size,
+            "mtime": mtime_ns / 1e9,
+            "hash": None,
+        }
+        try:
+            with open(os.path.join(self.wml_dir, name), "rb") as f:
+                contents = f.read()
+        except OSError as e:
+            logging.info(f"Unable to index WML {name}: {e}")
+            return entry
+
+        entry["hash"] = hashlib.sha256(contents).hexdigest()
+        try:
+            wml = json.loads(contents)
+            nodes, links = wml["nodes"], wml["links"]
+            if not isinstance(nodes, dict) or not isinstance(links, dict):
+                raise TypeError("nodes and links must be objects")
+            entry["nodes"], entry["links"] = len(nodes), len(links)
+
+            dag_id = next(
+                p.get("value")
+                for p in wml["dag"]["parameters"]
+                if p.get("id") == "dag_id"
+            )
+            entry["dag_id"] = None if dag_id is None else str(dag_id)
+        except (ValueError, KeyError, TypeError, AttributeError, StopIteration):
+            logging.debug(f"WML {name} is missing metadata")
+        return entry
+
+    def list_wmls(
+        self,
+        prefix: str = "",
+        sort: str = "name",
+        descending: bool = False,
+        offset: int = 0,
+        limit: int = None,
+    ):
+        """Refreshes the index and returns a page of entries
+
+        Args:
+            prefix (str, optional): Only include names starting with prefix
+            sort (str, optional): One of SORT_KEYS. Defaults to "name".
+            descending (bool, optional): Sort order. Defaults to False.
+            offset (int, optional): Number of entries to skip. Defaults to 0.
+            limit (int, optional): Max number of entries. Defaults to None (all).
+
+        Raises:
+            ValueError: If sort is not one of SORT_KEYS
+
+        Returns:
+            Tuple[int, List[Dict]]: Number of entries matching prefix, and the
+                page of entries
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unable to sort WMLs by '{sort}'")
+
+        self.refresh()
+        with self._lock:
+            entries = [e for n, e in self._entries.items() if n.startswith(prefix)]
+
+        # Entries missing the sort key go last, with name as a tiebreaker
+        entries.sort(key=lambda e: e["name"], reverse=descending)
+        present = [e for e in entries if e[sort] is not None]
+        missing = [e for e in entries if e[sort] is None]
+        present.sort(key=lambda e: e[sort], reverse=descending)
+        entries = present + missing
+
+        end = None if limit is None else offset + limit
+        return len(entries), [dict(e) for e in entries[offset:end]]
+
+
+_wml_index: WmlIndex = None
+
+
+def get_wml_index() -> WmlIndex:
+    return _wml_index
+
+
+def init_wml_index(wml_dir: str) -> WmlIndex:
+    """Replaces the global WML index
+
+    Args:
+        wml_dir (str): See WmlIndex
+
+    Returns:
+        WmlIndex: The global WML index
+    """
+    global _wml_index
+
+    _wml_index = WmlIndex(wml_dir)
+    return _wml_index
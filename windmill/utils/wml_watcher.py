@@ -0,0 +1,154 @@
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # Optional - falls back to polling
+    Observer = None
+
+
+class WmlWatcher:
+    def __init__(
+        self,
+        wml_dir: str,
+        on_change: Callable[[Dict[str, float]], None],
+        debounce: float = 0.3,
+        poll_interval: float = 1.0,
+        notifications: bool = True,
+    ):
+        """Watches a WML folder and calls on_change with each debounced batch of
+        changed files. Uses filesystem notifications if watchdog is installed,
+        otherwise polls the folder with os.scandir
+
+        Args:
+            wml_dir (str): Folder to watch
+            on_change (Callable[[Dict[str, float]], None]): Called with a mapping
+                of changed (including deleted) filenames to the time.monotonic()
+                the change was first seen
+            debounce (float, optional): Seconds without changes before a batch
+                is handled. Defaults to 0.3.
+            poll_interval (float, optional): Seconds between polls. Defaults to 1.0.
+            notifications (bool, optional): If False always poll. Defaults to True.
+        """
+        self.wml_dir = wml_dir
+        self.on_change = on_change
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.notifications = notifications and Observer is not None
+
+        self._events = queue.Queue()
+        # _stats is what was last handled, _polled what the last poll saw
+        self._stats = self.snapshot()
+        self._polled = dict(self._stats)
+        self._stop = threading.Event()
+        self._observer = None
+        self._poller = None
+
+    def snapshot(self) -> Dict[str, tuple]:
+        """Returns {filename: (mtime_ns, size)} for each file in wml_dir"""
+        stats = {}
+        with os.scandir(self.wml_dir) as it:
+            for entry in it:
+                if entry.is_file():
+                    stat = entry.stat()
+                    stats[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return stats
+
+    def notify(self, name: str):
+        """Flags a file as possibly changed"""
+        self._events.put((name, time.monotonic()))
+
+    def poll(self):
+        """Flags every file whose mtime or size changed since the last poll. Files
+        that haven't changed again aren't re-flagged while they wait to be handled,
+        so polling faster than the debounce doesn't hold batches back
+        """
+        stats = self.snapshot()
+        for name in stats.keys() | self._polled.keys():
+            if stats.get(name) != self._polled.get(name):
+                self.notify(name)
+        self._polled = stats
+
+    def _stat(self, name: str):
+        try:
+            stat = os.stat(os.path.join(self.wml_dir, name))
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _flush(self, pending: Dict[str, float]):
+        # Drop events that didn't change the file, e.g. temp files or touches
+        # that were reverted within the debounce window
+        changed = {}
+        for name, seen in pending.items():
+            stat = self._stat(name)
+            if stat != self._stats.get(name):
+                changed[name] = seen
+                if stat is None:
+                    self._stats.pop(name, None)
+                else:
+                    self._stats[name] = stat
+        if changed:
+            self.on_change(changed)
+
+    def start(self):
+        """Starts listening for changes in a background thread"""
+        if self.notifications:
+            watcher = self
+
+            class Handler(FileSystemEventHandler):
+                def on_any_event(self, event):
+                    if not event.is_directory:
+                        for path in [event.src_path, getattr(event, "dest_path", "")]:
+                            if path:
+                                watcher.notify(os.path.basename(path))
+
+            self._observer = Observer()
+            self._observer.schedule(Handler(), self.wml_dir, recursive=False)
+            self._observer.start()
+        else:
+            self._poller = threading.Thread(target=self._poll_loop, daemon=True)
+            self._poller.start()
+
+    def _poll_loop(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.poll()
+            except OSError as e:
+                logging.warning(f"Unable to poll {self.wml_dir}: {e}")
+
+    def run(self):
+        """Handles batches of changes until stop is called. Repeated changes to
+        a file are coalesced, and a batch is only handled once no change has been
+        seen for `debounce` seconds
+        """
+        self.start()
+        try:
+            while not self._stop.is_set():
+                try:
+                    name, seen = self._events.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+
+                pending = {name: seen}
+                while True:
+                    try:
+                        name, seen = self._events.get(timeout=self.debounce)
+                    except queue.Empty:
+                        break
+                    pending.setdefault(name, seen)
+                self._flush(pending)
+        finally:
+            self.stop()
+
+    def stop(self):
+        self._stop.set()
+        if self._observer:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
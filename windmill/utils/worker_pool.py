@@ -0,0 +1,224 @@
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from ..exceptions import WorkerError, WorkerTimeoutError
+
+
+def _worker_main(conn, initializer, memory_limit):
+    """Worker process loop - runs (func, args) jobs received on conn until it
+    receives None or the parent goes away
+    """
+    if memory_limit and resource:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+    if initializer:
+        initializer()
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+
+        func, args = job
+        try:
+            res = (True, func(*args))
+        except BaseException as e:
+            res = (False, e)
+
+        try:
+            conn.send(res)
+        except Exception as e:  # Result or exception can't be pickled
+            conn.send((False, WorkerError(f"{type(e).__name__}: {e}")))
+
+
+class _Worker:
+    def __init__(self, ctx, initializer, memory_limit):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, initializer, memory_limit),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+
+    @property
+    def pid(self):
+        return self.process.pid
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(1)
+        self.kill()
+
+    def kill(self):
+        # Process.kill is 3.7+ - SIGTERM first, then SIGKILL if it's ignored
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(1)
+            if self.process.is_alive() and hasattr(signal, "SIGKILL"):
+                os.kill(self.pid, signal.SIGKILL)
+            self.process.join()
+        self.conn.close()
+
+
+class WorkerPool:
+    def __init__(
+        self,
+        processes: int = 2,
+        timeout: float = 30,
+        memory_limit_mb: int = None,
+        max_jobs_per_worker: int = 100,
+        initializer=None,
+        prewarm: bool = True,
+    ):
+        """Pool of long-lived, spawned worker processes that run one job at a time.
+        Unlike multiprocessing.Pool, a job that times out or crashes only takes
+        down its own worker, which is replaced
+
+        Args:
+            processes (int, optional): Max number of workers. Defaults to 2.
+            timeout (float, optional): Default per-job timeout in seconds. Defaults to 30.
+            memory_limit_mb (int, optional): Address space limit for each worker.
+                Not supported on Windows. Defaults to None (unlimited).
+            max_jobs_per_worker (int, optional): Workers are recycled after this many
+                jobs. Defaults to 100.
+            initializer (callable, optional): Picklable function each worker runs
+                on startup, e.g. to pre-import modules. Defaults to None.
+            prewarm (bool, optional): If True all workers are started immediately,
+                otherwise on demand. Defaults to True.
+        """
+        self.processes = processes
+        self.timeout = timeout
+        self.memory_limit = memory_limit_mb * 1024 * 1024 if memory_limit_mb else None
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.initializer = initializer
+
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._started = 0
+        self._closed = False
+
+        if prewarm:
+            while self._reserve_slot():
+                self._idle.put(self._start_worker())
+
+    def _reserve_slot(self) -> bool:
+        """Takes a worker slot if the pool isn't full. The slot must be taken
+        before the worker is started so that concurrent callers can't overshoot
+        """
+        with self._lock:
+            if self._started < self.processes:
+                self._started += 1
+                return True
+        return False
+
+    def _release_slot(self):
+        with self._lock:
+            self._started -= 1
+
+    def _start_worker(self):
+        """Starts a worker in an already reserved slot, which is released if the
+        worker can't be started
+        """
+        try:
+            return _Worker(self._ctx, self.initializer, self.memory_limit)
+        except BaseException:
+            self._release_slot()
+            raise
+
+    def _retire_worker(self, worker, kill=False):
+        """Stops a worker, and replaces it in the same slot unless the pool is
+        closed so that the pool stays warm
+        """
+        worker.kill() if kill else worker.stop()
+
+        if self._closed:
+            self._release_slot()
+        else:
+            self._idle.put(self._start_worker())
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        if self._reserve_slot():
+            return self._start_worker()
+        return self._idle.get()
+
+    def run(self, func, *args, timeout: float = None):
+        """Runs func(*args) on a worker process and returns the result. Exceptions
+        raised by func are re-raised in the calling process
+
+        Args:
+            func (callable): Picklable (i.e. module level) function
+            timeout (float, optional): Overrides the pool timeout
+
+        Raises:
+            WorkerTimeoutError: If the job doesn't finish in time. The worker is killed
+            WorkerError: If the worker dies while running the job
+
+        Returns:
+            Any: The result of func(*args)
+        """
+        if self._closed:
+            raise WorkerError("Worker pool is closed")
+
+        timeout = self.timeout if timeout is None else timeout
+        worker = self._acquire()
+        res = None
+        try:
+            worker.conn.send((func, args))
+            if not worker.conn.poll(timeout):
+                self._retire_worker(worker, kill=True)
+                worker = None
+                raise WorkerTimeoutError(f"Job timed out after {timeout}s")
+            ok, res = worker.conn.recv()
+        except (EOFError, OSError) as e:
+            logging.warning(f"Worker {worker.pid} died: {e}")
+            self._retire_worker(worker, kill=True)
+            worker = None
+            raise WorkerError("Worker process died while running job") from e
+        finally:
+            if worker:
+                self._release(worker, recycle=isinstance(res, MemoryError))
+
+        if not ok:
+            raise res
+        return res
+
+    def _release(self, worker, recycle=False):
+        worker.jobs += 1
+        if recycle or self._closed or worker.jobs >= self.max_jobs_per_worker:
+            self._retire_worker(worker)
+        else:
+            self._idle.put(worker)
+
+    def close(self):
+        """Stops all idle workers. Busy workers are stopped when their job ends"""
+        if self._closed:
+            return
+        self._closed = True
+        while True:
+            try:
+                self._retire_worker(self._idle.get_nowait())
+            except queue.Empty:
+                break